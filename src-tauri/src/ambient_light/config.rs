@@ -14,6 +14,18 @@ pub enum Border {
     Right,
 }
 
+impl Border {
+    /// 边框名称，与序列化后的名称一致
+    pub fn as_str(&self) -> &'static str {
+        match self {
+            Border::Top => "Top",
+            Border::Bottom => "Bottom",
+            Border::Left => "Left",
+            Border::Right => "Right",
+        }
+    }
+}
+
 #[derive(Clone, Copy, Serialize, Deserialize, Debug, PartialEq, Default)]
 pub enum LedType {
     #[default]
@@ -229,6 +241,16 @@ pub struct SamplePointConfig {
 mod tests {
     use super::*;
 
+    #[test]
+    fn border_as_str_matches_serialized_name() {
+        for border in [Border::Top, Border::Bottom, Border::Left, Border::Right] {
+            assert_eq!(
+                serde_json::to_string(&border).unwrap(),
+                format!("\"{}\"", border.as_str())
+            );
+        }
+    }
+
     #[test]
     fn apply_reversal_reverses_when_enabled() {
         let strip = LedStripConfig {
@@ -226,12 +226,7 @@ impl ConfigManager {
                 log::info!(
                     "🔄 切换灯带反向状态: 显示器{} {}边 -> reversed={}",
                     display_id,
-                    match border {
-                        Border::Top => "Top",
-                        Border::Bottom => "Bottom",
-                        Border::Left => "Left",
-                        Border::Right => "Right",
-                    },
+                    border.as_str(),
                     strip.reversed
                 );
                 break;
@@ -1215,6 +1215,9 @@ impl LedColorsPublisher {
         let publisher = self.clone();
         let inner_tasks_version = self.inner_tasks_version.clone();
 
+        // 边框颜色在任务生命周期内不变，只生成一次四个边的颜色数据
+        let edge_colors = self.generate_edge_colors_from_constants(&border_colors);
+
         tokio::spawn(async move {
             let mut interval = tokio::time::interval(Duration::from_millis(33)); // 30Hz
 
@@ -1229,7 +1232,7 @@ impl LedColorsPublisher {
 
                 // 生成并发布定位色数据
                 if let Err(e) = publisher
-                    .generate_and_publish_config_colors(&config_group, &border_colors)
+                    .generate_and_publish_config_colors(&config_group, &edge_colors)
                     .await
                 {
                     log::error!("❌ 生成和发布定位色数据失败: {e}");
@@ -1249,10 +1252,9 @@ impl LedColorsPublisher {
     async fn generate_and_publish_config_colors(
         &self,
         config_group: &LedStripConfigGroup,
-        border_colors: &BorderColors,
+        edge_colors: &std::collections::HashMap<Border, [LedColor; 2]>,
     ) -> anyhow::Result<()> {
-        // 1. 根据边框颜色常量生成四个边的颜色数据
-        let edge_colors = self.generate_edge_colors_from_constants(border_colors);
+        // 1. 四个边的颜色数据由调用方预先生成（见 start_single_display_config_task）
 
         // 2. 读取完整的LED灯带配置以计算正确的全局偏移量
         // 使用V2配置管理器并转换为V1格式
@@ -1281,7 +1283,7 @@ impl LedColorsPublisher {
         let rgb_preview_buffer = self.generate_rgb_colors_for_preview(
             config_group,
             &all_configs,
-            &edge_colors,
+            edge_colors,
             active_strip,
         )?;
 
@@ -1394,41 +1396,37 @@ impl LedColorsPublisher {
         let mut sorted_strips = config_group.strips.clone();
         sorted_strips.sort_by_key(|s| s.index);
 
-        let mut buffer = Vec::new();
+        // 预计算总字节数以预分配缓冲区
+        let total_bytes: usize = sorted_strips
+            .iter()
+            .map(|s| {
+                let bytes_per_led = match s.led_type {
+                    LedType::WS2812B => 3,
+                    LedType::SK6812 => 4,
+                };
+                s.len * bytes_per_led
+            })
+            .sum();
+
+        let mut buffer = Vec::with_capacity(total_bytes);
 
         for strip in &sorted_strips {
             let default_colors = [LedColor::new(0, 0, 0), LedColor::new(0, 0, 0)];
             let colors = edge_colors.get(&strip.border).unwrap_or(&default_colors);
-
-            for physical_index in 0..strip.len {
-                let logical_index = if strip.reversed {
-                    strip.len - 1 - physical_index
-                } else {
-                    physical_index
-                };
-
-                let half_count = strip.len / 2;
-                let color = if logical_index < half_count {
-                    &colors[0]
-                } else {
-                    &colors[1]
-                };
-                let rgb = color.get_rgb();
-
-                match strip.led_type {
-                    LedType::WS2812B => {
-                        buffer.push(rgb[1]); // G
-                        buffer.push(rgb[0]); // R
-                        buffer.push(rgb[2]); // B
-                    }
-                    LedType::SK6812 => {
-                        buffer.push(rgb[1]); // G
-                        buffer.push(rgb[0]); // R
-                        buffer.push(rgb[2]); // B
-                        buffer.push(0); // W
-                    }
-                }
-            }
+            let bytes_per_led = match strip.led_type {
+                LedType::WS2812B => 3, // GRB
+                LedType::SK6812 => 4,  // GRBW
+            };
+            let [r0, g0, b0] = colors[0].get_rgb();
+            let [r1, g1, b1] = colors[1].get_rgb();
+
+            extend_with_split_colors(
+                &mut buffer,
+                strip.len,
+                strip.reversed,
+                &[g0, r0, b0, 0][..bytes_per_led],
+                &[g1, r1, b1, 0][..bytes_per_led],
+            );
         }
 
         Ok(buffer)
@@ -1456,10 +1454,7 @@ impl LedColorsPublisher {
             config_group.strips.iter().map(|s| s.index).collect();
 
         // 简单的正弦函数呼吸效果 - 1Hz频率
-        let time_ms = std::time::SystemTime::now()
-            .duration_since(std::time::UNIX_EPOCH)
-            .unwrap_or_default()
-            .as_millis();
+        let time_ms = breathing_clock_ms();
 
         let time_seconds = time_ms as f64 / 1000.0;
 
@@ -1474,7 +1469,7 @@ impl LedColorsPublisher {
             [0, 0, 0] // 黑色填充（关闭）
         };
 
-        let mut rgb_buffer = Vec::new();
+        let mut rgb_buffer = Vec::with_capacity(total_leds * 3);
 
         // 遍历所有灯带，按序列号顺序生成RGB数据
         for strip in &all_sorted_strips {
@@ -1489,47 +1484,33 @@ impl LedColorsPublisher {
                 let is_active_strip =
                     if let Some((active_display_id, ref active_border)) = active_strip {
                         strip.display_id == active_display_id
-                            && format!("{:?}", strip.border).to_lowercase()
-                                == active_border.to_lowercase()
+                            && strip.border.as_str().eq_ignore_ascii_case(active_border)
                     } else {
                         false
                     };
 
-                for physical_index in 0..strip.len {
-                    let logical_index = if strip.reversed {
-                        strip.len - 1 - physical_index
-                    } else {
-                        physical_index
-                    };
-
-                    let half_count = strip.len / 2;
-                    let color = if logical_index < half_count {
-                        &colors[0]
-                    } else {
-                        &colors[1]
-                    };
+                // 如果是活跃灯带，应用呼吸效果
+                let apply_breathing = |color: &LedColor| {
                     let mut rgb = color.get_rgb();
-
-                    // 如果是活跃灯带，应用呼吸效果
                     if is_active_strip {
                         rgb[0] = (rgb[0] as f32 * breathing_brightness) as u8;
                         rgb[1] = (rgb[1] as f32 * breathing_brightness) as u8;
                         rgb[2] = (rgb[2] as f32 * breathing_brightness) as u8;
                     }
+                    rgb
+                };
 
-                    // 添加RGB数据（每个LED 3字节）
-                    rgb_buffer.push(rgb[0]); // R
-                    rgb_buffer.push(rgb[1]); // G
-                    rgb_buffer.push(rgb[2]); // B
-                }
+                // 添加RGB数据（每个LED 3字节）
+                extend_with_split_colors(
+                    &mut rgb_buffer,
+                    strip.len,
+                    strip.reversed,
+                    &apply_breathing(&colors[0]),
+                    &apply_breathing(&colors[1]),
+                );
             } else {
                 // 其他显示器的灯带：填充颜色
-                for _led_index in 0..strip.len {
-                    // 添加RGB填充数据
-                    rgb_buffer.push(fill_rgb[0]); // R
-                    rgb_buffer.push(fill_rgb[1]); // G
-                    rgb_buffer.push(fill_rgb[2]); // B
-                }
+                extend_repeated(&mut rgb_buffer, &fill_rgb, strip.len);
             }
         }
 
@@ -1565,34 +1546,20 @@ impl LedColorsPublisher {
             .sum();
 
         let mut hardware_buffer = Vec::with_capacity(total_bytes);
-        let mut rgb_index = 0;
+        // 按固定3字节切分RGB数据，数据不足一个LED时自然结束
+        let mut rgb_pixels = rgb_buffer.chunks_exact(3);
 
         // 遍历所有灯带，将RGB数据转换为硬件格式
         for strip in &all_sorted_strips {
-            for _led_index in 0..strip.len {
-                if rgb_index + 2 < rgb_buffer.len() {
-                    let r = rgb_buffer[rgb_index];
-                    let g = rgb_buffer[rgb_index + 1];
-                    let b = rgb_buffer[rgb_index + 2];
-                    rgb_index += 3;
-
-                    // 根据LED类型转换为硬件格式
-                    match strip.led_type {
-                        LedType::WS2812B => {
-                            // GRB格式
-                            hardware_buffer.push(g); // G
-                            hardware_buffer.push(r); // R
-                            hardware_buffer.push(b); // B
-                        }
-                        LedType::SK6812 => {
-                            // GRBW格式
-                            hardware_buffer.push(g); // G
-                            hardware_buffer.push(r); // R
-                            hardware_buffer.push(b); // B
-                            hardware_buffer.push(0); // W (白色通道设为0)
-                        }
-                    }
-                }
+            // 根据LED类型确定硬件格式：GRB，或GRBW（白色通道设为0）
+            let bytes_per_led = match strip.led_type {
+                LedType::WS2812B => 3,
+                LedType::SK6812 => 4,
+            };
+
+            for pixel in rgb_pixels.by_ref().take(strip.len) {
+                let [r, g, b] = [pixel[0], pixel[1], pixel[2]];
+                hardware_buffer.extend_from_slice(&[g, r, b, 0][..bytes_per_led]);
             }
         }
 
@@ -1635,10 +1602,7 @@ impl LedColorsPublisher {
             config_group.strips.iter().map(|s| s.index).collect();
 
         // 简单的正弦函数呼吸效果 - 1Hz频率
-        let time_ms = std::time::SystemTime::now()
-            .duration_since(std::time::UNIX_EPOCH)
-            .unwrap_or_default()
-            .as_millis();
+        let time_ms = breathing_clock_ms();
 
         let time_seconds = time_ms as f64 / 1000.0;
 
@@ -1653,7 +1617,7 @@ impl LedColorsPublisher {
             ([0, 0, 0], 0) // 黑色填充（关闭）
         };
 
-        let mut buffer = Vec::new();
+        let mut buffer = Vec::with_capacity(total_bytes);
 
         // 遍历所有灯带，按序列号顺序生成完整的LED数据流
         for strip in &all_sorted_strips {
@@ -1668,15 +1632,11 @@ impl LedColorsPublisher {
                 let is_active_strip =
                     if let Some((active_display_id, ref active_border)) = active_strip {
                         strip.display_id == active_display_id
-                            && format!("{:?}", strip.border).to_lowercase()
-                                == active_border.to_lowercase()
+                            && strip.border.as_str().eq_ignore_ascii_case(active_border)
                     } else {
                         false
                     };
 
-                // 计算分段：前半部分用第一种颜色，后半部分用第二种颜色
-                let half_count = strip.len / 2;
-
                 if is_active_strip {
                     // 大幅减少日志频率：每10秒输出一次，而不是每秒
                     if (time_ms / 200) % 50 == 0 {
@@ -1690,46 +1650,29 @@ impl LedColorsPublisher {
                 }
                 // 移除非活跃灯带的debug日志，减少输出
 
-                // 为该灯带的所有LED生成定位色数据
-                for physical_index in 0..strip.len {
-                    // 根据reversed字段决定逻辑索引
-                    let logical_index = if strip.reversed {
-                        strip.len - 1 - physical_index // 反向：最后一个LED对应第一个逻辑位置
-                    } else {
-                        physical_index // 正向：物理索引等于逻辑索引
-                    };
-
-                    // 选择颜色：前半部分用第一种，后半部分用第二种（基于逻辑索引）
-                    let color = if logical_index < half_count {
-                        &colors[0] // 第一种颜色
-                    } else {
-                        &colors[1] // 第二种颜色
-                    };
+                // 如果是活跃灯带，应用优雅的呼吸效果；GRB格式，SK6812的W通道设为0
+                let to_hardware = |color: &LedColor| {
                     let mut rgb = color.get_rgb();
-
-                    // 如果是活跃灯带，应用优雅的呼吸效果
                     if is_active_strip {
                         rgb[0] = (rgb[0] as f32 * breathing_brightness) as u8;
                         rgb[1] = (rgb[1] as f32 * breathing_brightness) as u8;
                         rgb[2] = (rgb[2] as f32 * breathing_brightness) as u8;
                     }
+                    [rgb[1], rgb[0], rgb[2], 0]
+                };
+                let bytes_per_led = match strip.led_type {
+                    LedType::WS2812B => 3,
+                    LedType::SK6812 => 4,
+                };
 
-                    match strip.led_type {
-                        LedType::WS2812B => {
-                            // GRB格式
-                            buffer.push(rgb[1]); // G
-                            buffer.push(rgb[0]); // R
-                            buffer.push(rgb[2]); // B
-                        }
-                        LedType::SK6812 => {
-                            // GRBW格式
-                            buffer.push(rgb[1]); // G
-                            buffer.push(rgb[0]); // R
-                            buffer.push(rgb[2]); // B
-                            buffer.push(0); // W通道设为0
-                        }
-                    }
-                }
+                // 为该灯带的所有LED生成定位色数据：前半部分用第一种颜色，后半部分用第二种颜色
+                extend_with_split_colors(
+                    &mut buffer,
+                    strip.len,
+                    strip.reversed,
+                    &to_hardware(&colors[0])[..bytes_per_led],
+                    &to_hardware(&colors[1])[..bytes_per_led],
+                );
             } else {
                 // 其他显示器的灯带：根据是否有活跃灯带决定填充颜色
                 let fill_description = if active_strip.is_some() {
@@ -1740,43 +1683,20 @@ impl LedColorsPublisher {
                 log::debug!(
                     "🔲 其他显示器灯带 {} ({}边): {} LEDs, {}",
                     strip.index,
-                    match strip.border {
-                        Border::Top => "Top",
-                        Border::Bottom => "Bottom",
-                        Border::Left => "Left",
-                        Border::Right => "Right",
-                    },
+                    strip.border.as_str(),
                     strip.len,
                     fill_description
                 );
 
                 // 为该灯带的所有LED生成填充数据
-                for _led_index in 0..strip.len {
-                    match strip.led_type {
-                        LedType::WS2812B => {
-                            // GRB格式
-                            buffer.push(fill_rgb[1]); // G
-                            buffer.push(fill_rgb[0]); // R
-                            buffer.push(fill_rgb[2]); // B
-                        }
-                        LedType::SK6812 => {
-                            // GRBW格式
-                            if active_strip.is_some() {
-                                // 有活跃灯带时，只亮W通道
-                                buffer.push(0); // G = 0
-                                buffer.push(0); // R = 0
-                                buffer.push(0); // B = 0
-                                buffer.push(fill_w); // W
-                            } else {
-                                // 无活跃灯带时，全部关闭
-                                buffer.push(fill_rgb[1]); // G
-                                buffer.push(fill_rgb[0]); // R
-                                buffer.push(fill_rgb[2]); // B
-                                buffer.push(fill_w); // W
-                            }
-                        }
-                    }
-                }
+                let (fill_pixel, bytes_per_led) = match strip.led_type {
+                    // GRB格式
+                    LedType::WS2812B => ([fill_rgb[1], fill_rgb[0], fill_rgb[2], 0], 3),
+                    // GRBW格式：有活跃灯带时只亮W通道，否则全部关闭
+                    LedType::SK6812 if active_strip.is_some() => ([0, 0, 0, fill_w], 4),
+                    LedType::SK6812 => ([fill_rgb[1], fill_rgb[0], fill_rgb[2], fill_w], 4),
+                };
+                extend_repeated(&mut buffer, &fill_pixel[..bytes_per_led], strip.len);
             }
         }
 
@@ -1800,6 +1720,57 @@ impl LedColorsPublisher {
     }
 }
 
+/// 呼吸效果使用的单调时钟（毫秒）
+///
+/// 只需要相位，不需要日历时间；单调时钟不受系统时间调整影响，也省去了与 UNIX 纪元的换算
+fn breathing_clock_ms() -> u128 {
+    static EPOCH: std::sync::OnceLock<std::time::Instant> = std::sync::OnceLock::new();
+    EPOCH
+        .get_or_init(std::time::Instant::now)
+        .elapsed()
+        .as_millis()
+}
+
+/// 将单个LED的字节 `pixel` 重复 `count` 次追加到 `buffer`
+///
+/// 先写入一个LED，再以倍增方式从已写入部分复制，整段只需 O(log n) 次内存拷贝。
+fn extend_repeated(buffer: &mut Vec<u8>, pixel: &[u8], count: usize) {
+    if count == 0 || pixel.is_empty() {
+        return;
+    }
+
+    let start = buffer.len();
+    let total = pixel.len() * count;
+    buffer.reserve(total);
+    buffer.extend_from_slice(pixel);
+
+    while buffer.len() - start < total {
+        let filled = buffer.len() - start;
+        let copy_len = filled.min(total - filled);
+        buffer.extend_from_within(start..start + copy_len);
+    }
+}
+
+/// 按定位色规则填充一条灯带：逻辑前半部分用 `first`，后半部分用 `second`
+///
+/// 反向灯带的物理顺序相反，即先填充后半部分的颜色。
+fn extend_with_split_colors(
+    buffer: &mut Vec<u8>,
+    len: usize,
+    reversed: bool,
+    first: &[u8],
+    second: &[u8],
+) {
+    let half_count = len / 2;
+    if reversed {
+        extend_repeated(buffer, second, len - half_count);
+        extend_repeated(buffer, first, half_count);
+    } else {
+        extend_repeated(buffer, first, half_count);
+        extend_repeated(buffer, second, len - half_count);
+    }
+}
+
 #[derive(Debug, Clone)]
 pub struct AllColorConfig {
     pub sample_point_groups: Vec<DisplaySamplePointGroup>,
@@ -1953,6 +1924,42 @@ mod tests {
         assert_eq!(second_strip, vec![5, 4, 3]);
     }
 
+    #[test]
+    fn extend_with_split_colors_matches_per_led_mapping() {
+        for len in [0, 1, 2, 5, 60, 61] {
+            for reversed in [false, true] {
+                let mut expected = Vec::new();
+                for physical_index in 0..len {
+                    let logical_index = if reversed {
+                        len - 1 - physical_index
+                    } else {
+                        physical_index
+                    };
+                    if logical_index < len / 2 {
+                        expected.extend_from_slice(&[1, 2, 3, 4]);
+                    } else {
+                        expected.extend_from_slice(&[5, 6, 7, 8]);
+                    }
+                }
+
+                let mut buffer = vec![9];
+                super::extend_with_split_colors(
+                    &mut buffer,
+                    len,
+                    reversed,
+                    &[1, 2, 3, 4],
+                    &[5, 6, 7, 8],
+                );
+                assert_eq!(buffer[0], 9);
+                assert_eq!(
+                    &buffer[1..],
+                    &expected[..],
+                    "len={len}, reversed={reversed}"
+                );
+            }
+        }
+    }
+
     #[tokio::test]
     async fn test_ws2812b_color_transformation_and_calibration() {
         let sender = MockLedDataSender::new();
@@ -5,7 +5,7 @@ use serde::{Deserialize, Serialize};
 use std::fs;
 use std::path::PathBuf;
 use std::sync::Arc;
-use tokio::sync::{OnceCell, RwLock};
+use tokio::sync::{watch, OnceCell, RwLock};
 
 const CONFIG_FILE_NAME: &str = "cc.ivanli.ambient_light/ambient_light_state.toml";
 
@@ -63,6 +63,8 @@ impl AmbientLightState {
 
 pub struct AmbientLightStateManager {
     state: Arc<RwLock<AmbientLightState>>,
+    /// 启用状态变化通知，供后台任务等待状态切换而无需轮询
+    enabled_sender: watch::Sender<bool>,
 }
 
 impl AmbientLightStateManager {
@@ -83,8 +85,11 @@ impl AmbientLightStateManager {
                     }
                 };
 
+                let (enabled_sender, _) = watch::channel(state.enabled);
+
                 Self {
                     state: Arc::new(RwLock::new(state)),
+                    enabled_sender,
                 }
             })
             .await
@@ -105,6 +110,8 @@ impl AmbientLightStateManager {
         {
             let mut state = self.state.write().await;
             state.enabled = enabled;
+            // 持有写锁时通知，保证通道中的值与状态一致
+            self.enabled_sender.send_replace(enabled);
         }
 
         // Save to file
@@ -132,6 +139,11 @@ impl AmbientLightStateManager {
         Ok(())
     }
 
+    /// Subscribe to enabled state changes
+    pub fn subscribe_enabled(&self) -> watch::Receiver<bool> {
+        self.enabled_sender.subscribe()
+    }
+
     /// Toggle ambient light state
     pub async fn toggle(&self) -> anyhow::Result<bool> {
         let current_enabled = self.is_enabled().await;
@@ -4,6 +4,33 @@ use serde::{Deserialize, Serialize};
 use std::fs;
 use std::path::PathBuf;
 
+/// LaunchAgent plist template up to the executable path
+const PLIST_HEAD: &str = r#"<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
+<plist version="1.0">
+<dict>
+    <key>Label</key>
+    <string>cc.ivanli.ambient-light.desktop</string>
+    <key>ProgramArguments</key>
+    <array>
+        <string>"#;
+
+/// LaunchAgent plist template after the executable path
+const PLIST_TAIL: &str = r#"</string>
+    </array>
+    <key>RunAtLoad</key>
+    <true/>
+    <key>KeepAlive</key>
+    <false/>
+    <key>LaunchOnlyOnce</key>
+    <true/>
+    <key>StandardOutPath</key>
+    <string>/tmp/ambient-light-control.out</string>
+    <key>StandardErrorPath</key>
+    <string>/tmp/ambient-light-control.err</string>
+</dict>
+</plist>"#;
+
 #[derive(Debug, Serialize, Deserialize, Default)]
 pub struct AutoStartConfig {
     pub enabled: bool,
@@ -18,10 +45,8 @@ impl AutoStartManager {
 
         let launch_agents_dir = home_dir.join("Library/LaunchAgents");
 
-        // Create the LaunchAgents directory if it doesn't exist
-        if !launch_agents_dir.exists() {
-            fs::create_dir_all(&launch_agents_dir)?;
-        }
+        // Create the LaunchAgents directory if it doesn't exist (no-op when it does)
+        fs::create_dir_all(&launch_agents_dir)?;
 
         Ok(launch_agents_dir.join("cc.ivanli.ambient-light.desktop.plist"))
     }
@@ -36,30 +61,11 @@ impl AutoStartManager {
     fn create_plist_content() -> Result<String> {
         let exe_path = Self::get_executable_path()?;
 
-        let plist_content = format!(
-            r#"<?xml version="1.0" encoding="UTF-8"?>
-<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
-<plist version="1.0">
-<dict>
-    <key>Label</key>
-    <string>cc.ivanli.ambient-light.desktop</string>
-    <key>ProgramArguments</key>
-    <array>
-        <string>{exe_path}</string>
-    </array>
-    <key>RunAtLoad</key>
-    <true/>
-    <key>KeepAlive</key>
-    <false/>
-    <key>LaunchOnlyOnce</key>
-    <true/>
-    <key>StandardOutPath</key>
-    <string>/tmp/ambient-light-control.out</string>
-    <key>StandardErrorPath</key>
-    <string>/tmp/ambient-light-control.err</string>
-</dict>
-</plist>"#
-        );
+        let mut plist_content =
+            String::with_capacity(PLIST_HEAD.len() + exe_path.len() + PLIST_TAIL.len());
+        plist_content.push_str(PLIST_HEAD);
+        plist_content.push_str(&exe_path);
+        plist_content.push_str(PLIST_TAIL);
 
         Ok(plist_content)
     }
@@ -151,6 +157,9 @@ mod tests {
         assert!(content.contains("cc.ivanli.ambient-light.desktop"));
         assert!(content.contains("RunAtLoad"));
         assert!(content.contains("<true/>"));
+
+        let exe_path = AutoStartManager::get_executable_path().unwrap();
+        assert!(content.contains(&format!("<string>{exe_path}</string>")));
     }
 
     #[test]
@@ -179,6 +179,17 @@ impl WebSocketManager {
         self.sender.send(message).map(|_| ())
     }
 
+    /// 获取某个事件的订阅者数量
+    ///
+    /// 高频事件在构造消息（拷贝颜色数据）之前先检查，无人订阅时直接跳过。
+    pub async fn subscriber_count(&self, event_type: &str) -> usize {
+        let subscriptions = self.subscriptions.read().await;
+        subscriptions
+            .values()
+            .filter(|events| events.contains(event_type))
+            .count()
+    }
+
     /// 根据订阅情况发送消息
     pub async fn send_to_subscribers(
         &self,
@@ -341,19 +352,34 @@ async fn handle_socket(socket: WebSocket, state: AppState) {
         loop {
             match ws_receiver.recv().await {
                 Ok(msg) => {
-                    let text = match serde_json::to_string(&msg) {
-                        Ok(text) => text,
-                        Err(e) => {
-                            log::error!("序列化WebSocket消息失败: {e}");
-                            continue;
+                    // 一次唤醒写入所有已到达的广播消息，最后只flush一次
+                    let mut next = Some(msg);
+                    let mut send_failed = false;
+                    while let Some(msg) = next {
+                        match serde_json::to_string(&msg) {
+                            Ok(text) => {
+                                if sender.feed(Message::Text(text)).await.is_err() {
+                                    send_failed = true;
+                                    break;
+                                }
+                            }
+                            Err(e) => log::error!("序列化WebSocket消息失败: {e}"),
                         }
-                    };
 
-                    if sender.send(Message::Text(text)).await.is_err() {
+                        next = match ws_receiver.try_recv() {
+                            Ok(msg) => Some(msg),
+                            Err(broadcast::error::TryRecvError::Lagged(skipped)) => {
+                                log::warn!("WebSocket接收器滞后，跳过了 {} 条消息", skipped);
+                                None
+                            }
+                            Err(_) => None,
+                        };
+                    }
+
+                    if send_failed || sender.flush().await.is_err() {
                         log::debug!("WebSocket发送消息失败，连接可能已断开");
                         break;
                     }
-                    // 移除成功发送的日志，减少输出
                 }
                 Err(broadcast::error::RecvError::Closed) => {
                     log::debug!("WebSocket广播通道已关闭");
@@ -54,7 +54,24 @@ impl Serialize for LedColor {
     where
         S: serde::Serializer,
     {
-        let hex = format!("#{}", hex::encode(self.0));
-        serializer.serialize_str(hex.as_str())
+        // "#rrggbb" 固定7字节，直接在栈上编码，避免两次堆分配
+        let mut hex = [b'#'; 7];
+        hex::encode_to_slice(self.0, &mut hex[1..]).map_err(serde::ser::Error::custom)?;
+        let hex = std::str::from_utf8(&hex).map_err(serde::ser::Error::custom)?;
+        serializer.serialize_str(hex)
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_serialize_as_hex_string() {
+        let color = LedColor::new(0x12, 0xab, 0xff);
+        assert_eq!(serde_json::to_string(&color).unwrap(), "\"#12abff\"");
+
+        let black = LedColor::default();
+        assert_eq!(serde_json::to_string(&black).unwrap(), "\"#000000\"");
     }
 }
@@ -2,7 +2,7 @@ use anyhow::Result;
 use log::{debug, warn};
 
 use crate::{
-    ambient_light::{Border, ColorCalibration, LedStripConfig, LedStripConfigV2, LedType},
+    ambient_light::{ColorCalibration, LedStripConfig, LedStripConfigV2, LedType},
     display::DisplayRegistry,
     led_color::LedColor,
     led_data_sender::DataSendMode,
@@ -273,68 +273,37 @@ impl LedDataProcessor {
                     led_colors.len()
                 );
                 // 添加黑色作为后备
-                for _ in 0..strip_len {
-                    match strip.led_type {
-                        LedType::WS2812B => complete_led_data.extend_from_slice(&[0, 0, 0]),
-                        LedType::SK6812 => complete_led_data.extend_from_slice(&[0, 0, 0, 0]),
-                    }
-                }
+                Self::encode_strip_into(
+                    &mut complete_led_data,
+                    &[],
+                    strip_len,
+                    strip.led_type,
+                    color_calibration,
+                );
                 total_leds += strip_len;
                 continue;
             }
 
             let strip_colors = &led_colors[strip_index];
 
-            // 将这个灯带的数据添加到完整数据流中
-            for i in 0..strip_len {
-                if i < strip_colors.len() {
-                    let color = strip_colors[i];
-                    let rgb = color.get_rgb();
-
-                    // 应用颜色校准
-                    let calibrated_r = (rgb[0] as f32 * color_calibration.r) as u8;
-                    let calibrated_g = (rgb[1] as f32 * color_calibration.g) as u8;
-                    let calibrated_b = (rgb[2] as f32 * color_calibration.b) as u8;
-
-                    match strip.led_type {
-                        LedType::WS2812B => {
-                            // GRB格式
-                            complete_led_data.extend_from_slice(&[
-                                calibrated_g, // G (Green)
-                                calibrated_r, // R (Red)
-                                calibrated_b, // B (Blue)
-                            ]);
-                        }
-                        LedType::SK6812 => {
-                            // GRBW格式，W通道单独校准
-                            let w_channel = Self::calculate_white_channel(
-                                calibrated_r,
-                                calibrated_g,
-                                calibrated_b,
-                            );
-                            let calibrated_w = (w_channel as f32 * color_calibration.w) as u8;
-                            complete_led_data.extend_from_slice(&[
-                                calibrated_g, // G (Green)
-                                calibrated_r, // R (Red)
-                                calibrated_b, // B (Blue)
-                                calibrated_w, // W (White)
-                            ]);
-                        }
-                    }
-                } else {
-                    warn!(
-                        "LED索引 {} 超出灯带颜色数组范围 ({})",
-                        i,
-                        strip_colors.len()
-                    );
-                    // 添加黑色作为后备
-                    match strip.led_type {
-                        LedType::WS2812B => complete_led_data.extend_from_slice(&[0, 0, 0]),
-                        LedType::SK6812 => complete_led_data.extend_from_slice(&[0, 0, 0, 0]),
-                    }
-                }
+            if strip_colors.len() < strip_len {
+                warn!(
+                    "灯带 {} 颜色数据不足: {} < {}，缺少的LED填充黑色",
+                    strip_index,
+                    strip_colors.len(),
+                    strip_len
+                );
             }
 
+            // 将这个灯带的数据添加到完整数据流中
+            Self::encode_strip_into(
+                &mut complete_led_data,
+                strip_colors,
+                strip_len,
+                strip.led_type,
+                color_calibration,
+            );
+
             total_leds += strip_len;
         }
 
@@ -431,9 +400,19 @@ impl LedDataProcessor {
             start_led_offset
         );
 
-        // 计算总LED数量和每个LED的字节数
+        // 计算总LED数量和总字节数，预分配缓冲区
         let total_leds: usize = strips.iter().map(|s| s.len).sum();
-        let mut complete_led_data = Vec::new();
+        let total_bytes: usize = strips
+            .iter()
+            .map(|strip| {
+                let bytes_per_led = match strip.led_type {
+                    LedType::WS2812B => 3,
+                    LedType::SK6812 => 4,
+                };
+                strip.len * bytes_per_led
+            })
+            .sum();
+        let mut complete_led_data = Vec::with_capacity(total_bytes);
 
         // 按strips顺序处理每个灯带
         for (strip_index, strip) in strips.iter().enumerate() {
@@ -444,59 +423,22 @@ impl LedDataProcessor {
                 strip.index, strip.len, strip.led_type, strip.display_internal_id
             );
 
-            // 处理每个LED
-            for i in 0..strip.len {
-                if i < strip_colors.len() {
-                    let color = &strip_colors[i];
-                    let rgb = color.get_rgb();
-
-                    // 应用颜色校准
-                    let calibrated_r = (rgb[0] as f32 * color_calibration.r) as u8;
-                    let calibrated_g = (rgb[1] as f32 * color_calibration.g) as u8;
-                    let calibrated_b = (rgb[2] as f32 * color_calibration.b) as u8;
-
-                    match strip.led_type {
-                        LedType::WS2812B => {
-                            // GRB格式
-                            complete_led_data.extend_from_slice(&[
-                                calibrated_g, // G (Green)
-                                calibrated_r, // R (Red)
-                                calibrated_b, // B (Blue)
-                            ]);
-                        }
-                        LedType::SK6812 => {
-                            // GRBW格式，W通道单独校准
-                            let w_channel = Self::calculate_white_channel(
-                                calibrated_r,
-                                calibrated_g,
-                                calibrated_b,
-                            );
-                            let calibrated_w = (w_channel as f32 * color_calibration.w) as u8;
-                            complete_led_data.extend_from_slice(&[
-                                calibrated_g, // G (Green)
-                                calibrated_r, // R (Red)
-                                calibrated_b, // B (Blue)
-                                calibrated_w, // W (White)
-                            ]);
-                        }
-                    }
-                } else {
-                    warn!(
-                        "LED索引 {} 超出V2灯带颜色数组范围 ({})",
-                        i,
-                        strip_colors.len()
-                    );
-                    // 填充黑色
-                    match strip.led_type {
-                        LedType::WS2812B => {
-                            complete_led_data.extend_from_slice(&[0, 0, 0]);
-                        }
-                        LedType::SK6812 => {
-                            complete_led_data.extend_from_slice(&[0, 0, 0, 0]);
-                        }
-                    }
-                }
+            if strip_colors.len() < strip.len {
+                warn!(
+                    "V2灯带 {} 颜色数据不足: {} < {}，缺少的LED填充黑色",
+                    strip.index,
+                    strip_colors.len(),
+                    strip.len
+                );
             }
+
+            Self::encode_strip_into(
+                &mut complete_led_data,
+                strip_colors,
+                strip.len,
+                strip.led_type,
+                color_calibration,
+            );
         }
 
         debug!(
@@ -508,6 +450,73 @@ impl LedDataProcessor {
         Ok(complete_led_data)
     }
 
+    /// 将一条灯带的颜色编码为硬件格式（应用颜色校准）并追加到缓冲区
+    ///
+    /// LED类型和校准方式只在灯带级别判断一次；颜色数据不足 `strip_len` 时用黑色补齐，多余的忽略
+    fn encode_strip_into(
+        buffer: &mut Vec<u8>,
+        strip_colors: &[LedColor],
+        strip_len: usize,
+        led_type: LedType,
+        color_calibration: &ColorCalibration,
+    ) {
+        let colors = &strip_colors[..strip_colors.len().min(strip_len)];
+
+        // 默认校准（全为1.0）不改变颜色，整条灯带直接使用原始RGB，跳过逐LED的浮点运算
+        let is_identity =
+            color_calibration.r == 1.0 && color_calibration.g == 1.0 && color_calibration.b == 1.0;
+        if is_identity {
+            Self::encode_colors_into(buffer, colors, led_type, color_calibration.w, |color| {
+                let [r, g, b] = color.get_rgb();
+                (r, g, b)
+            });
+        } else {
+            Self::encode_colors_into(buffer, colors, led_type, color_calibration.w, |color| {
+                let [r, g, b] = color.get_rgb();
+                (
+                    (r as f32 * color_calibration.r) as u8,
+                    (g as f32 * color_calibration.g) as u8,
+                    (b as f32 * color_calibration.b) as u8,
+                )
+            });
+        }
+
+        let bytes_per_led = match led_type {
+            LedType::WS2812B => 3,
+            LedType::SK6812 => 4,
+        };
+        // 缺少的LED填充黑色
+        buffer.resize(buffer.len() + (strip_len - colors.len()) * bytes_per_led, 0);
+    }
+
+    /// 按LED类型将颜色编码为GRB/GRBW并追加到缓冲区，RGB通道由 `calibrate` 校准
+    fn encode_colors_into(
+        buffer: &mut Vec<u8>,
+        colors: &[LedColor],
+        led_type: LedType,
+        w_calibration: f32,
+        calibrate: impl Fn(&LedColor) -> (u8, u8, u8),
+    ) {
+        match led_type {
+            LedType::WS2812B => {
+                for color in colors {
+                    let (r, g, b) = calibrate(color);
+                    // GRB格式
+                    buffer.extend_from_slice(&[g, r, b]);
+                }
+            }
+            LedType::SK6812 => {
+                for color in colors {
+                    let (r, g, b) = calibrate(color);
+                    // GRBW格式，W通道单独校准
+                    let w = Self::calculate_white_channel(r, g, b);
+                    let w = (w as f32 * w_calibration) as u8;
+                    buffer.extend_from_slice(&[g, r, b, w]);
+                }
+            }
+        }
+    }
+
     /// 计算SK6812的白色通道值
     ///
     /// 基于RGB值计算合适的白色通道值
@@ -537,12 +546,7 @@ impl LedDataProcessor {
         for (strip, colors) in strips.iter().zip(led_colors.iter()) {
             let rgb_bytes: Vec<u8> = colors.iter().flat_map(|color| color.get_rgb()).collect();
 
-            let border_str = match strip.border {
-                Border::Top => "Top",
-                Border::Bottom => "Bottom",
-                Border::Left => "Left",
-                Border::Right => "Right",
-            };
+            let border_str = strip.border.as_str();
 
             websocket_publisher
                 .publish_led_strip_colors_changed(
@@ -567,12 +571,7 @@ impl LedDataProcessor {
         for (strip, colors) in strips.iter().zip(led_colors.iter()) {
             let rgb_bytes: Vec<u8> = colors.iter().flat_map(|color| color.get_rgb()).collect();
 
-            let border_str = match strip.border {
-                Border::Top => "Top",
-                Border::Bottom => "Bottom",
-                Border::Left => "Left",
-                Border::Right => "Right",
-            };
+            let border_str = strip.border.as_str();
 
             // 通过DisplayRegistry将internal_id转换为system_id
             let display_id = match display_registry
@@ -601,3 +600,49 @@ impl LedDataProcessor {
         }
     }
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_encode_strip_into_pads_and_truncates() {
+        let calibration = ColorCalibration {
+            r: 1.0,
+            g: 1.0,
+            b: 1.0,
+            w: 1.0,
+        };
+        let colors = [LedColor::new(10, 20, 30), LedColor::new(40, 50, 60)];
+
+        let mut buffer = Vec::new();
+        LedDataProcessor::encode_strip_into(
+            &mut buffer,
+            &colors,
+            3,
+            LedType::WS2812B,
+            &calibration,
+        );
+        assert_eq!(buffer, vec![20, 10, 30, 50, 40, 60, 0, 0, 0]);
+
+        let mut buffer = Vec::new();
+        LedDataProcessor::encode_strip_into(&mut buffer, &colors, 1, LedType::SK6812, &calibration);
+        assert_eq!(buffer, vec![20, 10, 30, 10]);
+    }
+
+    #[test]
+    fn test_encode_strip_into_applies_calibration() {
+        let calibration = ColorCalibration {
+            r: 0.5,
+            g: 1.0,
+            b: 0.0,
+            w: 0.5,
+        };
+        let colors = [LedColor::new(200, 100, 50)];
+
+        let mut buffer = Vec::new();
+        LedDataProcessor::encode_strip_into(&mut buffer, &colors, 1, LedType::SK6812, &calibration);
+        // R: 200*0.5=100, G: 100, B: 0, W: min(100,100,0)*0.5=0
+        assert_eq!(buffer, vec![100, 100, 0, 0]);
+    }
+}
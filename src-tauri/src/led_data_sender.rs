@@ -2,12 +2,14 @@ use dirs::config_dir;
 use log::{error, info, warn};
 use serde::{Deserialize, Serialize};
 use std::net::SocketAddr;
+use std::ops::Range;
 use std::path::PathBuf;
 use std::str::FromStr;
 use std::sync::Arc;
-use tokio::fs::OpenOptions;
+use std::time::{SystemTime, UNIX_EPOCH};
+use tokio::fs::{File, OpenOptions};
 use tokio::io::AsyncWriteExt;
-use tokio::sync::{OnceCell, RwLock};
+use tokio::sync::{mpsc, OnceCell, RwLock};
 
 use crate::{led_status_manager::LedStatusManager, rpc::UdpRpc};
 
@@ -27,6 +29,23 @@ pub enum DataSendMode {
     ColorCalibration,
 }
 
+impl DataSendMode {
+    /// 根据数据源名称确定发送模式，未知来源按屏幕氛围光处理
+    pub fn from_source(source: &str) -> Self {
+        match source {
+            "StripConfig" => DataSendMode::StripConfig,
+            "TestEffect" => DataSendMode::TestEffect,
+            "ColorCalibration" => DataSendMode::ColorCalibration,
+            _ => DataSendMode::AmbientLight,
+        }
+    }
+
+    /// 该模式是否优先发送到指定的目标设备
+    fn targets_single_device(self) -> bool {
+        matches!(self, DataSendMode::TestEffect | DataSendMode::StripConfig)
+    }
+}
+
 impl std::fmt::Display for DataSendMode {
     fn fmt(&self, f: &mut std::fmt::Formatter<'_>) -> std::fmt::Result {
         match self {
@@ -39,34 +58,95 @@ impl std::fmt::Display for DataSendMode {
     }
 }
 
-/// LED数据包信息
-#[derive(Debug, Clone)]
-pub struct LedDataPacket {
-    /// 字节偏移量
-    pub offset: u16,
-    /// 颜色数据
-    pub data: Vec<u8>,
-    /// 数据源描述（用于日志）
-    pub source: String,
-}
+/// 0x02 LED数据协议的包头标识
+pub const LED_DATA_PACKET_HEADER: u8 = 0x02;
+
+/// 0x02 协议包头长度：标识 + 2字节大端偏移量
+pub const LED_DATA_PACKET_HEADER_LEN: usize = 3;
+
+/// 每个UDP包的最大数据大小（硬件限制：不超过400字节）
+pub const MAX_PACKET_DATA_SIZE: usize = 400;
+
+/// 0x02 LED数据包的切分与编码
+pub struct LedDataPacket;
 
 impl LedDataPacket {
-    pub fn new(offset: u16, data: Vec<u8>, source: String) -> Self {
-        Self {
-            offset,
-            data,
-            source,
+    /// 按硬件限制将LED数据流切分为 `(偏移量, 数据切片)`，直接引用原数据，不复制
+    pub fn chunks(
+        start_offset: u16,
+        complete_data: &[u8],
+    ) -> impl Iterator<Item = (u16, &[u8])> + '_ {
+        complete_data
+            .chunks(MAX_PACKET_DATA_SIZE)
+            .enumerate()
+            .map(move |(index, chunk)| {
+                (start_offset + (index * MAX_PACKET_DATA_SIZE) as u16, chunk)
+            })
+    }
+
+    /// 将0x02协议数据包追加写入已有缓冲区
+    pub fn encode_into(offset: u16, data: &[u8], buffer: &mut Vec<u8>) {
+        let [offset_high, offset_low] = offset.to_be_bytes();
+
+        buffer.extend_from_slice(&[LED_DATA_PACKET_HEADER, offset_high, offset_low]); // Header + Offset
+        buffer.extend_from_slice(data); // Color data
+    }
+}
+
+/// 按秒缓存的日志时间戳
+///
+/// 同一秒内的数据包共用已格式化的日期时间部分，只拼接毫秒
+#[derive(Debug, Default)]
+struct TimestampCache {
+    second: u64,
+    prefix: String,
+}
+
+impl TimestampCache {
+    /// 生成 `%Y-%m-%d %H:%M:%S%.3f` 格式的本地时间戳
+    fn format(&mut self, now: SystemTime) -> String {
+        let since_epoch = now.duration_since(UNIX_EPOCH).unwrap_or_default();
+        let second = since_epoch.as_secs();
+
+        // 每秒只做一次本地时区转换和完整格式化
+        if self.prefix.is_empty() || second != self.second {
+            self.second = second;
+            self.prefix = chrono::DateTime::<chrono::Local>::from(now)
+                .format("%Y-%m-%d %H:%M:%S")
+                .to_string();
         }
+
+        format!("{}.{:03}", self.prefix, since_epoch.subsec_millis())
     }
+}
+
+/// 将字节序列格式化为以空格分隔的小写十六进制字符串
+///
+/// 查表写入预分配的字符串，避免每个字节单独分配一个 `String`
+fn hex_with_spaces(data: &[u8]) -> String {
+    const HEX_DIGITS: &[u8; 16] = b"0123456789abcdef";
 
-    /// 构建0x02协议数据包
-    pub fn build_packet(&self) -> Vec<u8> {
-        let mut packet = vec![0x02]; // Header
-        packet.push((self.offset >> 8) as u8); // Offset high
-        packet.push((self.offset & 0xff) as u8); // Offset low
-        packet.extend_from_slice(&self.data); // Color data
-        packet
+    let mut hex = String::with_capacity(data.len() * 3);
+    for (index, byte) in data.iter().enumerate() {
+        if index > 0 {
+            hex.push(' ');
+        }
+        hex.push(HEX_DIGITS[(byte >> 4) as usize] as char);
+        hex.push(HEX_DIGITS[(byte & 0x0f) as usize] as char);
     }
+    hex
+}
+
+/// UDP日志队列容量，写入跟不上时丢弃多余的日志条目而不阻塞发送
+const UDP_LOG_QUEUE_CAPACITY: usize = 1024;
+
+/// 待写入UDP日志文件的一帧数据包
+///
+/// 直接接管发送时的整帧缓冲区，每个数据包以 `(偏移量, 缓冲区范围)` 表示，不再逐包复制
+struct UdpLogEntry {
+    time: SystemTime,
+    frame: Vec<u8>,
+    packets: Vec<(u16, Range<usize>)>,
 }
 
 /// 统一的LED数据发送管理器
@@ -75,6 +155,8 @@ pub struct LedDataSender {
     current_mode: Arc<RwLock<DataSendMode>>,
     /// 测试模式下的目标地址
     test_target_address: Arc<RwLock<Option<SocketAddr>>>,
+    /// UDP日志队列，由后台任务格式化并写入文件
+    udp_log_sender: mpsc::Sender<UdpLogEntry>,
 }
 
 impl LedDataSender {
@@ -84,9 +166,13 @@ impl LedDataSender {
 
         LED_DATA_SENDER
             .get_or_init(|| async {
+                let (udp_log_sender, udp_log_receiver) = mpsc::channel(UDP_LOG_QUEUE_CAPACITY);
+                tokio::spawn(Self::run_udp_log_writer(udp_log_receiver));
+
                 LedDataSender {
                     current_mode: Arc::new(RwLock::new(DataSendMode::default())),
                     test_target_address: Arc::new(RwLock::new(None)),
+                    udp_log_sender,
                 }
             })
             .await
@@ -100,49 +186,96 @@ impl LedDataSender {
             .join("udp_packets.log")
     }
 
-    /// 写入UDP数据包到日志文件
-    async fn write_udp_packet_to_file(&self, offset: u16, packet_data: &[u8]) {
+    /// 打开UDP日志文件（追加模式），并确保目录存在
+    async fn open_udp_log_file() -> Option<File> {
         let log_path = Self::get_udp_log_path();
 
-        // 确保目录存在
         if let Some(parent) = log_path.parent() {
             if let Err(e) = tokio::fs::create_dir_all(parent).await {
                 error!("Failed to create UDP log directory: {e}");
-                return;
+                return None;
             }
         }
 
-        // 格式化时间戳
-        let timestamp = chrono::Local::now().format("%Y-%m-%d %H:%M:%S%.3f");
-
-        // 格式化十六进制数据
-        let hex_data = packet_data
-            .iter()
-            .map(|b| format!("{b:02x}"))
-            .collect::<Vec<_>>()
-            .join(" ");
-
-        // 构建日志行
-        let log_line = format!("[{timestamp}] UDP Packet (offset={offset}): {hex_data}\n");
-
-        // 写入文件
         match OpenOptions::new()
             .create(true)
             .append(true)
             .open(&log_path)
             .await
         {
-            Ok(mut file) => {
-                if let Err(e) = file.write_all(log_line.as_bytes()).await {
-                    error!("Failed to write UDP packet to log file: {e}");
-                }
-            }
+            Ok(file) => Some(file),
             Err(e) => {
                 error!("Failed to open UDP log file: {e}");
+                None
             }
         }
     }
 
+    /// UDP日志写入任务：在后台格式化日志行并写入文件
+    ///
+    /// 文件只打开一次并保持打开，写入失败后在下一条日志时重新打开
+    async fn run_udp_log_writer(mut receiver: mpsc::Receiver<UdpLogEntry>) {
+        use std::fmt::Write as _;
+
+        let mut timestamp_cache = TimestampCache::default();
+        let mut file = None;
+        let mut lines = String::new();
+
+        while let Some(entry) = receiver.recv().await {
+            // 一次唤醒取完队列中已到达的全部条目，合并为一次文件写入
+            lines.clear();
+            let entries =
+                std::iter::once(entry).chain(std::iter::from_fn(|| receiver.try_recv().ok()));
+            for entry in entries {
+                let timestamp = timestamp_cache.format(entry.time);
+                for (offset, range) in entry.packets {
+                    let _ = writeln!(
+                        lines,
+                        "[{}] UDP Packet (offset={}): {}",
+                        timestamp,
+                        offset,
+                        hex_with_spaces(&entry.frame[range])
+                    );
+                }
+            }
+
+            if file.is_none() {
+                file = Self::open_udp_log_file().await;
+            }
+            let Some(log_file) = file.as_mut() else {
+                continue;
+            };
+
+            // tokio 的文件写入经由后台线程完成，flush 确保内容真正落盘
+            let result = match log_file.write_all(lines.as_bytes()).await {
+                Ok(()) => log_file.flush().await,
+                Err(e) => Err(e),
+            };
+            if let Err(e) = result {
+                error!("Failed to write UDP packet to log file: {e}");
+                file = None;
+            }
+        }
+    }
+
+    /// 将一帧UDP数据包加入日志队列，格式化和文件写入由后台任务完成
+    fn enqueue_udp_packet_log(
+        &self,
+        time: SystemTime,
+        frame: Vec<u8>,
+        packets: Vec<(u16, Range<usize>)>,
+    ) {
+        let entry = UdpLogEntry {
+            time,
+            frame,
+            packets,
+        };
+
+        if self.udp_log_sender.try_send(entry).is_err() {
+            log::debug!("UDP log queue is full, dropping frame log entry");
+        }
+    }
+
     /// 设置测试模式的目标地址
     pub async fn set_test_target(&self, address: Option<String>) {
         let mut target = self.test_target_address.write().await;
@@ -199,12 +332,17 @@ impl LedDataSender {
         current_mode == mode
     }
 
-    /// 发送LED数据包（统一入口）
-    pub async fn send_packet(
+    /// 将一帧的 `(偏移量, 数据)` 编码为0x02数据包并发送
+    async fn send_frame(
         &self,
-        packet: LedDataPacket,
+        chunks: &[(u16, &[u8])],
+        source: &str,
         expected_mode: DataSendMode,
     ) -> anyhow::Result<()> {
+        let Some(&(first_offset, _)) = chunks.first() else {
+            return Ok(());
+        };
+
         // 检查当前模式是否允许发送
         if !self.can_send(expected_mode).await {
             let current_mode = self.get_mode().await;
@@ -223,64 +361,74 @@ impl LedDataSender {
         }
         let udp_rpc = udp_rpc.as_ref().unwrap();
 
-        // 构建并发送数据包
-        let packet_data = packet.build_packet();
-
-        // 只在debug级别记录基本信息，避免频繁的详细日志
-        log::debug!(
-            "Sending LED packet: mode={}, offset={}, data_len={}",
-            expected_mode,
-            packet.offset,
-            packet.data.len()
-        );
-
-        // 写入UDP数据包到日志文件
-        self.write_udp_packet_to_file(packet.offset, &packet_data)
-            .await;
+        // 将本帧的全部数据包编码进同一块连续缓冲区，再按包边界切片发送
+        let total_bytes: usize = chunks
+            .iter()
+            .map(|(_, data)| LED_DATA_PACKET_HEADER_LEN + data.len())
+            .sum();
+        let mut frame_buffer = Vec::with_capacity(total_bytes);
+        let mut packet_ranges = Vec::with_capacity(chunks.len());
+        for &(offset, data) in chunks {
+            let start = frame_buffer.len();
+            LedDataPacket::encode_into(offset, data, &mut frame_buffer);
+            packet_ranges.push((offset, start..frame_buffer.len()));
+        }
+        let packet_datas: Vec<&[u8]> = packet_ranges
+            .iter()
+            .map(|(_, range)| &frame_buffer[range.clone()])
+            .collect();
+        let sent_at = SystemTime::now();
 
         // 根据模式选择发送方式
-        let send_result = if expected_mode == DataSendMode::TestEffect
-            || expected_mode == DataSendMode::StripConfig
-        {
+        let send_result = if expected_mode.targets_single_device() {
             let target_addr_option = *self.test_target_address.read().await;
 
             if let Some(target_addr) = target_addr_option {
                 // 首先尝试发送到已知设备
-                match udp_rpc.send_to(&packet_data, target_addr).await {
+                match udp_rpc.send_batch_to(&packet_datas, target_addr).await {
                     Ok(()) => Ok(()),
                     Err(e) => {
                         log::warn!("⚠️ Failed to send to known device: {e}, trying direct send...");
                         // 如果失败，尝试直接发送（用于调试设备）
-                        udp_rpc.send_to_direct(&packet_data, target_addr).await
+                        udp_rpc
+                            .send_batch_to_direct(&packet_datas, target_addr)
+                            .await
                     }
                 }
             } else {
                 warn!(
                     "⚠️ {} mode is active, but no target address is set. Using broadcast mode.",
-                    packet.source
+                    source
                 );
-                udp_rpc.send_to_all(&packet_data).await
+                udp_rpc.send_batch_to_all(&packet_datas).await
             }
         } else {
-            udp_rpc.send_to_all(&packet_data).await
+            udp_rpc.send_batch_to_all(&packet_datas).await
         };
 
+        // 发送完成后将整帧缓冲区交给日志任务，无需逐包复制
+        drop(packet_datas);
+        self.enqueue_udp_packet_log(sent_at, frame_buffer, packet_ranges);
+
         match send_result {
             Ok(_) => {
+                // 每帧只记录一条debug日志，避免频繁的详细日志
                 log::debug!(
-                    "✅ Successfully sent LED packet: {} (offset={}, {} bytes)",
-                    packet.source,
-                    packet.offset,
-                    packet_data.len()
+                    "✅ Successfully sent LED packets: {} (offset={}, {} packets, {} bytes)",
+                    source,
+                    first_offset,
+                    chunks.len(),
+                    total_bytes
                 );
                 Ok(())
             }
             Err(e) => {
                 error!(
-                    "❌ Failed to send LED packet: {} (offset={}, {} bytes): {}",
-                    packet.source,
-                    packet.offset,
-                    packet_data.len(),
+                    "❌ Failed to send LED packets: {} (offset={}, {} packets, {} bytes): {}",
+                    source,
+                    first_offset,
+                    chunks.len(),
+                    total_bytes,
                     e
                 );
                 Err(e)
@@ -295,35 +443,16 @@ impl LedDataSender {
         complete_data: Vec<u8>,
         source: &str,
     ) -> anyhow::Result<()> {
-        let mode = match source {
-            "AmbientLight" => DataSendMode::AmbientLight,
-            "StripConfig" => DataSendMode::StripConfig,
-            "TestEffect" => DataSendMode::TestEffect,
-            "ColorCalibration" => DataSendMode::ColorCalibration,
-            _ => DataSendMode::AmbientLight,
-        };
+        let mode = DataSendMode::from_source(source);
 
         // 注意：LED颜色预览数据由 ambient_light/publisher.rs 负责发布
         // 这里不再重复发布，避免数据混乱和重复事件
 
-        // 拆分数据为UDP包
-        let max_data_size = 400; // 每个UDP包的最大数据大小（硬件限制：不超过400字节）
-        let mut current_offset = start_offset;
-        let mut remaining_data = complete_data.as_slice();
-
-        let mut packet_count = 0;
-        while !remaining_data.is_empty() {
-            let chunk_size = std::cmp::min(max_data_size, remaining_data.len());
-            let chunk = remaining_data[..chunk_size].to_vec();
-            remaining_data = &remaining_data[chunk_size..];
-
-            packet_count += 1;
-
-            let packet = LedDataPacket::new(current_offset, chunk, source.to_string());
-            self.send_packet(packet, mode).await?;
-
-            current_offset += chunk_size as u16;
-        }
+        // 按包大小切分数据（只引用原数据，不复制），整帧一起发送
+        let chunks: Vec<(u16, &[u8])> =
+            LedDataPacket::chunks(start_offset, &complete_data).collect();
+        let packet_count = chunks.len();
+        self.send_frame(&chunks, source, mode).await?;
 
         // 记录发送统计信息到状态管理器
         let status_manager = LedStatusManager::global().await;
@@ -337,30 +466,108 @@ impl LedDataSender {
         Ok(())
     }
 
-    /// 强制发送数据包（忽略模式检查，用于特殊情况如关闭LED）
-    pub async fn force_send_packet(&self, packet: LedDataPacket) -> anyhow::Result<()> {
-        let udp_rpc = UdpRpc::global().await;
-        if let Err(err) = udp_rpc {
-            warn!("UDP RPC not available: {err}");
-            return Err(anyhow::anyhow!("UDP RPC not available: {}", err));
-        }
-        let udp_rpc = udp_rpc.as_ref().unwrap();
+    /// Get statistics about the current state (for testing/debugging)
+    pub async fn get_stats(&self) -> String {
+        let mode = self.get_mode().await;
+        format!("Current mode: {mode}")
+    }
+}
 
-        let packet_data = packet.build_packet();
+#[cfg(test)]
+mod tests {
+    use super::*;
 
-        log::info!(
-            "Force sending LED packet: source={}, offset={}, data_len={}",
-            packet.source,
-            packet.offset,
-            packet.data.len()
+    #[test]
+    fn test_data_send_mode_from_source() {
+        assert_eq!(
+            DataSendMode::from_source("StripConfig"),
+            DataSendMode::StripConfig
+        );
+        assert_eq!(
+            DataSendMode::from_source("TestEffect"),
+            DataSendMode::TestEffect
+        );
+        assert_eq!(
+            DataSendMode::from_source("ColorCalibration"),
+            DataSendMode::ColorCalibration
+        );
+        assert_eq!(
+            DataSendMode::from_source("AmbientLight"),
+            DataSendMode::AmbientLight
         );
+        // 未知来源（如 ClearData）按屏幕氛围光处理
+        assert_eq!(
+            DataSendMode::from_source("ClearData"),
+            DataSendMode::AmbientLight
+        );
+    }
+
+    #[test]
+    fn test_chunks_by_hardware_limit() {
+        let data: Vec<u8> = (0..1000).map(|i| (i % 256) as u8).collect();
+        let chunks: Vec<(u16, &[u8])> = LedDataPacket::chunks(12, &data).collect();
+
+        assert_eq!(chunks.len(), 3);
+        assert_eq!(chunks[0].0, 12);
+        assert_eq!(chunks[1].0, 412);
+        assert_eq!(chunks[2].0, 812);
+        assert_eq!(chunks[2].1.len(), 200);
 
-        udp_rpc.send_to_all(&packet_data).await
+        // 切片直接引用原数据
+        assert_eq!(chunks[0].1.as_ptr(), data.as_ptr());
+
+        let rebuilt: Vec<u8> = chunks.iter().flat_map(|(_, it)| it.to_vec()).collect();
+        assert_eq!(rebuilt, data);
     }
 
-    /// Get statistics about the current state (for testing/debugging)
-    pub async fn get_stats(&self) -> String {
-        let mode = self.get_mode().await;
-        format!("Current mode: {mode}")
+    #[test]
+    fn test_encode_packet_header() {
+        let mut packet = Vec::new();
+        LedDataPacket::encode_into(0x1234, &[10, 20, 30], &mut packet);
+
+        assert_eq!(packet, vec![0x02, 0x12, 0x34, 10, 20, 30]);
+    }
+
+    #[test]
+    fn test_encode_into_appends_packets() {
+        let mut buffer = Vec::new();
+        LedDataPacket::encode_into(0, &[1, 2], &mut buffer);
+        LedDataPacket::encode_into(400, &[3], &mut buffer);
+
+        assert_eq!(buffer, vec![0x02, 0x00, 0x00, 1, 2, 0x02, 0x01, 0x90, 3]);
+    }
+
+    #[test]
+    fn test_timestamp_cache_matches_full_format() {
+        let mut cache = TimestampCache::default();
+        let first = UNIX_EPOCH + std::time::Duration::from_millis(1_700_000_000_123);
+        let second = first + std::time::Duration::from_millis(5);
+        let next_second = first + std::time::Duration::from_millis(1_000);
+
+        for time in [first, second, next_second] {
+            let expected = chrono::DateTime::<chrono::Local>::from(time)
+                .format("%Y-%m-%d %H:%M:%S%.3f")
+                .to_string();
+            assert_eq!(cache.format(time), expected);
+        }
+    }
+
+    #[test]
+    fn test_hex_with_spaces() {
+        assert_eq!(hex_with_spaces(&[]), "");
+        assert_eq!(hex_with_spaces(&[0x02, 0x00, 0xab, 0xff]), "02 00 ab ff");
+
+        let all_bytes: Vec<u8> = (0..=255).collect();
+        let expected = all_bytes
+            .iter()
+            .map(|b| format!("{b:02x}"))
+            .collect::<Vec<_>>()
+            .join(" ");
+        assert_eq!(hex_with_spaces(&all_bytes), expected);
+    }
+
+    #[test]
+    fn test_chunks_empty_data() {
+        assert!(LedDataPacket::chunks(0, &[]).next().is_none());
     }
 }
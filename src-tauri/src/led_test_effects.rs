@@ -157,10 +157,11 @@ impl LedTestEffectManager {
             };
 
             // 计算当前时间
+            let frame_started_at = Instant::now();
             let elapsed_ms = task.start_time.elapsed().as_millis() as u64;
 
-            // 生成LED颜色数据
-            let colors = LedTestEffects::generate_colors(&task.config, elapsed_ms);
+            // 生成LED颜色数据（RGB，硬件编码由数据处理器统一完成）
+            let colors = LedTestEffects::generate_rgb_colors(&task.config, elapsed_ms);
 
             // 使用配置中的字节偏移量
             let byte_offset = task.config.offset as u16;
@@ -175,25 +176,13 @@ impl LedTestEffectManager {
             }
 
             // 等待下一次更新，或者被取消
-            // 使用较小的时间片来提高取消响应速度
-            let sleep_duration = Duration::from_millis(task.update_interval_ms as u64);
-            let chunk_size = Duration::from_millis(10); // 10ms时间片
-
-            let mut remaining = sleep_duration;
-            while remaining > Duration::ZERO {
-                let current_sleep = if remaining > chunk_size {
-                    chunk_size
-                } else {
-                    remaining
-                };
-
-                tokio::select! {
-                    _ = tokio::time::sleep(current_sleep) => {
-                        remaining = remaining.saturating_sub(current_sleep);
-                    }
-                    _ = task.cancellation_token.cancelled() => {
-                        return Ok(()); // 立即返回，不继续循环
-                    }
+            // 取消令牌会立即唤醒等待，无需切成小时间片轮询
+            let next_frame_at =
+                frame_started_at + Duration::from_millis(task.update_interval_ms as u64);
+            tokio::select! {
+                _ = tokio::time::sleep_until(next_frame_at) => {}
+                _ = task.cancellation_token.cancelled() => {
+                    return Ok(()); // 立即返回，不继续循环
                 }
             }
         }
@@ -206,7 +195,7 @@ impl LedTestEffectManager {
         &self,
         board_address: &str,
         offset: u16,
-        data: Vec<u8>,
+        rgb_colors: Vec<crate::led_color::LedColor>,
     ) -> anyhow::Result<()> {
         // 获取任务配置以确定LED类型和数量
         let task_config = {
@@ -222,9 +211,6 @@ impl LedTestEffectManager {
             }
         };
 
-        // 将硬件数据转换为RGB颜色数组用于预览
-        let rgb_colors = LedTestEffects::hardware_data_to_rgb_colors(&data, &config.led_type);
-
         // 使用LED数据处理器来发布预览数据并编码硬件数据
         let hardware_data = crate::led_data_processor::LedDataProcessor::process_test_mode(
             rgb_colors,
@@ -263,12 +249,8 @@ impl LedTestEffectManager {
     ) -> anyhow::Result<()> {
         log::info!("🧹 Sending clear data to {board_address} without changing mode");
 
-        let bytes_per_led = if LedTestEffects::is_rgbw_type(&config.led_type) {
-            4
-        } else {
-            3
-        };
-        let clear_data = vec![0u8; (config.led_count * bytes_per_led) as usize];
+        let bytes_per_led = LedTestEffects::bytes_per_led(config.led_type);
+        let clear_data = vec![0u8; config.led_count as usize * bytes_per_led];
         let byte_offset = config.offset as u16;
 
         // 直接发送清除数据，不通过send_test_data避免模式冲突
@@ -300,74 +282,34 @@ impl Clone for LedTestEffectManager {
 pub struct LedTestEffects;
 
 impl LedTestEffects {
-    /// Check if LED type supports white channel (RGBW)
-    fn is_rgbw_type(led_type: &LedType) -> bool {
-        matches!(led_type, LedType::SK6812)
-    }
-
-    /// Convert RGB buffer to GRB for WS2812B
-    fn convert_rgb_to_grb(buffer: &mut [u8]) {
-        let bytes_per_led = 3; // RGB only
-        for i in (0..buffer.len()).step_by(bytes_per_led) {
-            if i + 2 < buffer.len() {
-                // Swap R and G: [R, G, B] -> [G, R, B]
-                buffer.swap(i, i + 1);
-            }
-        }
-    }
-
-    /// Convert RGBW buffer to GRBW for SK6812-RGBW
-    fn convert_rgbw_to_grbw(buffer: &mut [u8]) {
-        let bytes_per_led = 4; // RGBW
-        for i in (0..buffer.len()).step_by(bytes_per_led) {
-            if i + 3 < buffer.len() {
-                // Swap R and G: [R, G, B, W] -> [G, R, B, W]
-                buffer.swap(i, i + 1);
-            }
+    /// Bytes per LED in the raw buffer: RGBW types carry an extra white channel
+    fn bytes_per_led(led_type: LedType) -> usize {
+        match led_type {
+            LedType::WS2812B => 3,
+            LedType::SK6812 => 4,
         }
     }
 
-    /// 将硬件数据转换为RGB颜色数组（用于预览）
-    fn hardware_data_to_rgb_colors(
-        data: &[u8],
-        led_type: &LedType,
+    /// Generate RGB colors for a specific test effect at a given time
+    ///
+    /// 直接生成RGB颜色，避免先转换为硬件顺序再解析回RGB
+    pub fn generate_rgb_colors(
+        config: &TestEffectConfig,
+        time_ms: u64,
     ) -> Vec<crate::led_color::LedColor> {
-        let mut rgb_colors = Vec::new();
+        let bytes_per_led = Self::bytes_per_led(config.led_type);
 
-        let bytes_per_led = match led_type {
-            LedType::WS2812B => 3, // RGB
-            LedType::SK6812 => 4,  // RGBW
-        };
-
-        let mut i = 0;
-        while i + bytes_per_led <= data.len() {
-            match led_type {
-                LedType::WS2812B => {
-                    // GRB格式 -> RGB
-                    let g = data[i];
-                    let r = data[i + 1];
-                    let b = data[i + 2];
-                    rgb_colors.push(crate::led_color::LedColor::new(r, g, b));
-                }
-                LedType::SK6812 => {
-                    // GRBW格式 -> RGB（忽略W通道）
-                    let g = data[i];
-                    let r = data[i + 1];
-                    let b = data[i + 2];
-                    // 忽略W通道 data[i + 3]
-                    rgb_colors.push(crate::led_color::LedColor::new(r, g, b));
-                }
-            }
-            i += bytes_per_led;
-        }
-
-        rgb_colors
+        Self::generate_rgb_buffer(config, time_ms)
+            .chunks_exact(bytes_per_led)
+            .map(|led| crate::led_color::LedColor::new(led[0], led[1], led[2]))
+            .collect()
     }
-    /// Generate LED colors for a specific test effect at a given time
-    pub fn generate_colors(config: &TestEffectConfig, time_ms: u64) -> Vec<u8> {
+
+    /// Generate the raw RGB(W) buffer of a test effect, before color order conversion
+    fn generate_rgb_buffer(config: &TestEffectConfig, time_ms: u64) -> Vec<u8> {
         let time_seconds = time_ms as f64 / 1000.0;
 
-        let mut buffer = match config.effect_type {
+        match config.effect_type {
             TestEffectType::FlowingRainbow => Self::flowing_rainbow(
                 config.led_count,
                 config.led_type,
@@ -389,38 +331,22 @@ impl LedTestEffects {
                 time_seconds,
                 config.speed,
             ),
-        };
-
-        // Convert RGB to correct color order based on LED type
-        match config.led_type {
-            LedType::WS2812B => {
-                Self::convert_rgb_to_grb(&mut buffer);
-            }
-            LedType::SK6812 => {
-                Self::convert_rgbw_to_grbw(&mut buffer);
-            }
         }
-
-        buffer
     }
 
     /// Flowing rainbow effect - smooth rainbow colors flowing along the strip
     fn flowing_rainbow(led_count: u32, led_type: LedType, time: f64, speed: f64) -> Vec<u8> {
-        let mut buffer = Vec::new();
+        let bytes_per_led = Self::bytes_per_led(led_type);
+        let mut buffer = Vec::with_capacity(led_count as usize * bytes_per_led);
         let time_offset = (time * speed * 60.0) % 360.0; // 60 degrees per second at speed 1.0
 
         for i in 0..led_count {
             // Create longer wavelength for smoother color transitions
             let hue = ((i as f64 * 720.0 / led_count as f64) + time_offset) % 360.0;
-            let rgb = Self::hsv_to_rgb(hue, 1.0, 1.0);
-
-            buffer.push(rgb.0);
-            buffer.push(rgb.1);
-            buffer.push(rgb.2);
+            let (r, g, b) = Self::hsv_to_rgb(hue, 1.0, 1.0);
 
-            if Self::is_rgbw_type(&led_type) {
-                buffer.push(0); // White channel - 不点亮白色通道
-            }
+            // White channel (if any) - 不点亮白色通道
+            buffer.extend_from_slice(&[r, g, b, 0][..bytes_per_led]);
         }
 
         buffer
@@ -428,7 +354,8 @@ impl LedTestEffects {
 
     /// Group counting effect - every 10 LEDs have different colors
     fn group_counting(led_count: u32, led_type: LedType) -> Vec<u8> {
-        let mut buffer = Vec::new();
+        let bytes_per_led = Self::bytes_per_led(led_type);
+        let mut buffer = Vec::with_capacity(led_count as usize * bytes_per_led);
 
         let group_colors = [
             (255, 0, 0),     // Red (1-10)
@@ -445,15 +372,10 @@ impl LedTestEffects {
 
         for i in 0..led_count {
             let group_index = (i / 10) % group_colors.len() as u32;
-            let color = group_colors[group_index as usize];
+            let (r, g, b) = group_colors[group_index as usize];
 
-            buffer.push(color.0);
-            buffer.push(color.1);
-            buffer.push(color.2);
-
-            if Self::is_rgbw_type(&led_type) {
-                buffer.push(0); // White channel - 不点亮白色通道
-            }
+            // White channel (if any) - 不点亮白色通道
+            buffer.extend_from_slice(&[r, g, b, 0][..bytes_per_led]);
         }
 
         buffer
@@ -461,53 +383,29 @@ impl LedTestEffects {
 
     /// Single LED scan effect - one LED moves along the strip
     fn single_scan(led_count: u32, led_type: LedType, time: f64, speed: f64) -> Vec<u8> {
-        let mut buffer = Vec::new();
+        let bytes_per_led = Self::bytes_per_led(led_type);
         let scan_period = 2.0 / speed; // 2 seconds per full scan at speed 1.0
         let active_index = ((time / scan_period * led_count as f64) as u32) % led_count;
 
-        for i in 0..led_count {
-            if i == active_index {
-                // Bright white LED
-                buffer.push(255);
-                buffer.push(255);
-                buffer.push(255);
-
-                if Self::is_rgbw_type(&led_type) {
-                    buffer.push(0); // White channel - 不点亮白色通道
-                }
-            } else {
-                // Off
-                buffer.push(0);
-                buffer.push(0);
-                buffer.push(0);
-
-                if Self::is_rgbw_type(&led_type) {
-                    buffer.push(0); // White channel - 不点亮白色通道
-                }
-            }
-        }
+        // All LEDs off
+        let mut buffer = vec![0; led_count as usize * bytes_per_led];
+
+        // Bright white LED, white channel (if any) - 不点亮白色通道
+        let start = active_index as usize * bytes_per_led;
+        buffer[start..start + 3].fill(255);
 
         buffer
     }
 
     /// Breathing effect - entire strip breathes with white light
     fn breathing(led_count: u32, led_type: LedType, time: f64, speed: f64) -> Vec<u8> {
-        let mut buffer = Vec::new();
+        let bytes_per_led = Self::bytes_per_led(led_type);
         let breathing_period = 4.0 / speed; // 4 seconds per breath at speed 1.0
         let brightness = ((time / breathing_period * 2.0 * PI).sin() * 0.5 + 0.5) * 255.0;
         let brightness = brightness as u8;
 
-        for _i in 0..led_count {
-            buffer.push(brightness);
-            buffer.push(brightness);
-            buffer.push(brightness);
-
-            if Self::is_rgbw_type(&led_type) {
-                buffer.push(brightness); // White channel
-            }
-        }
-
-        buffer
+        // RGB and white channel (if any) all breathe together
+        [brightness; 4][..bytes_per_led].repeat(led_count as usize)
     }
 
     /// Convert HSV to RGB
@@ -569,12 +467,10 @@ mod tests {
             offset: 0,
         };
 
-        let colors_data = LedTestEffects::generate_colors(&config, 0);
+        let colors_data = LedTestEffects::generate_rgb_buffer(&config, 0);
         assert_eq!(colors_data.len(), 30); // 10 LEDs * 3 bytes per LED = 30 bytes
 
-        // Convert hardware data back to RGB colors for verification
-        let rgb_colors =
-            LedTestEffects::hardware_data_to_rgb_colors(&colors_data, &config.led_type);
+        let rgb_colors = LedTestEffects::generate_rgb_colors(&config, 0);
         assert_eq!(rgb_colors.len(), 10); // 10 LEDs
     }
 
@@ -588,12 +484,13 @@ mod tests {
             offset: 0,
         };
 
-        let colors_data = LedTestEffects::generate_colors(&config, 0);
+        let colors_data = LedTestEffects::generate_rgb_buffer(&config, 0);
         assert_eq!(colors_data.len(), 60); // 20 LEDs * 3 bytes per LED = 60 bytes
 
-        // Convert hardware data back to RGB colors for testing
-        let rgb_colors =
-            LedTestEffects::hardware_data_to_rgb_colors(&colors_data, &config.led_type);
+        // Raw buffer is in RGB order
+        assert_eq!(&colors_data[..3], &[255, 0, 0]); // RGB: Red
+
+        let rgb_colors = LedTestEffects::generate_rgb_colors(&config, 0);
         assert_eq!(rgb_colors.len(), 20); // 20 LEDs
 
         // First 10 should be red
@@ -604,4 +501,26 @@ mod tests {
         let tenth_color = rgb_colors[10].get_rgb();
         assert_eq!(tenth_color, [0, 255, 0]); // RGB: Green
     }
+
+    #[test]
+    fn test_generate_rgb_colors_matches_rgbw_buffer() {
+        let config = TestEffectConfig {
+            effect_type: TestEffectType::FlowingRainbow,
+            led_count: 12,
+            led_type: LedType::SK6812,
+            speed: 1.0,
+            offset: 0,
+        };
+
+        let rgbw_data = LedTestEffects::generate_rgb_buffer(&config, 500);
+        assert_eq!(rgbw_data.len(), 48); // 12 LEDs * 4 bytes per LED = 48 bytes
+
+        let rgb_colors = LedTestEffects::generate_rgb_colors(&config, 500);
+        assert_eq!(rgb_colors.len(), 12);
+
+        for (led, color) in rgbw_data.chunks_exact(4).zip(rgb_colors.iter()) {
+            // RGBW -> RGB
+            assert_eq!(color.get_rgb(), [led[0], led[1], led[2]]);
+        }
+    }
 }
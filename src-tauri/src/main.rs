@@ -520,6 +520,16 @@ fn handle_ambient_light_protocol<R: Runtime>(
     }
 }
 
+/// 等待 Ctrl+C 信号，无头模式和浏览器模式下以此保持进程运行
+async fn wait_for_ctrl_c() {
+    if let Err(e) = tokio::signal::ctrl_c().await {
+        error!("Failed to listen for Ctrl+C: {}", e);
+        // 无法监听信号时保持运行，由系统终止进程
+        std::future::pending::<()>().await;
+    }
+    info!("🛑 Ctrl+C received, shutting down");
+}
+
 #[tokio::main]
 async fn main() {
     env_logger::init();
@@ -694,10 +704,9 @@ async fn main() {
             }
         });
 
-        // 在无头模式下保持程序运行
-        loop {
-            tokio::time::sleep(tokio::time::Duration::from_secs(1)).await;
-        }
+        // 在无头模式下保持程序运行，直到收到 Ctrl+C
+        wait_for_ctrl_c().await;
+        return;
     }
 
     // 如果是浏览器模式，启动后端服务（不启动GUI）
@@ -716,10 +725,9 @@ async fn main() {
             }
         });
 
-        // 在浏览器模式下保持程序运行
-        loop {
-            tokio::time::sleep(tokio::time::Duration::from_secs(1)).await;
-        }
+        // 在浏览器模式下保持程序运行，直到收到 Ctrl+C
+        wait_for_ctrl_c().await;
+        return;
     }
 
     tauri::Builder::default()
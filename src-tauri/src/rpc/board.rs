@@ -5,16 +5,32 @@ use std::{
 };
 
 use paris::{error, info, warn};
-use tokio::{io, net::UdpSocket, sync::RwLock, task::yield_now, time::timeout};
+use tokio::{
+    io,
+    net::UdpSocket,
+    sync::{broadcast, OnceCell, RwLock},
+    time::timeout,
+};
 
 use crate::{ambient_light::ConfigManager, rpc::DisplaySettingRequest, volume::VolumeManager};
 
-use super::{BoardConnectStatus, BoardInfo, BoardMessageChannels};
+use super::{bind_udp_socket, BoardConnectStatus, BoardInfo, BoardMessageChannels};
+
+/// 心跳包，设备原样返回作为 pong
+const PING_PACKET: [u8; 1] = [1];
+/// 显示器亮度指令
+const CMD_DISPLAY_BRIGHTNESS: u8 = 3;
+/// 音量指令
+const CMD_VOLUME: u8 = 4;
+/// 颜色校准指令
+const CMD_COLOR_CALIBRATION: u8 = 5;
 
 #[derive(Debug)]
 pub struct Board {
     pub info: Arc<RwLock<BoardInfo>>,
     socket: Option<Arc<UdpSocket>>,
+    /// 连接检查使用的套接字，首次检查时创建并复用
+    probe_socket: OnceCell<UdpSocket>,
     listen_handler: Option<tokio::task::JoinHandle<()>>,
     volume_changed_subscriber_handler: Option<tokio::task::JoinHandle<()>>,
     state_of_displays_changed_subscriber_handler: Option<tokio::task::JoinHandle<()>>,
@@ -26,6 +42,7 @@ impl Board {
         Self {
             info: Arc::new(RwLock::new(info)),
             socket: None,
+            probe_socket: OnceCell::new(),
             listen_handler: None,
             volume_changed_subscriber_handler: None,
             state_of_displays_changed_subscriber_handler: None,
@@ -41,7 +58,7 @@ impl Board {
     pub async fn init_socket(&mut self) -> anyhow::Result<()> {
         let info = self.info.clone();
         let info = info.read().await;
-        let socket = UdpSocket::bind("0.0.0.0:0").await?;
+        let socket = bind_udp_socket()?;
 
         socket.connect((info.address, info.port)).await?;
         let socket = Arc::new(socket);
@@ -59,34 +76,25 @@ impl Board {
                 board_message_channels.volume_setting_request_sender.clone();
 
             loop {
-                match socket.recv(&mut buf).await {
-                    Ok(len) => {
-                        log::info!("recv: {:?}", &buf[..len]);
-                        if buf[0] == 3 {
-                            let result =
-                                display_setting_request_sender.send(DisplaySettingRequest {
-                                    display_index: buf[1] as usize,
-                                    setting: crate::rpc::DisplaySetting::Brightness(buf[2]),
-                                });
-
-                            if let Err(err) = result {
-                                error!("send display setting request to channel failed: {:?}", err);
-                            }
-                        } else if buf[0] == 4 {
-                            let result = volume_setting_request_sender.send(buf[1] as f32 / 100.0);
-                            if let Err(err) = result {
-                                error!("send volume setting request to channel failed: {:?}", err);
-                            }
+                // 等待socket可读，唤醒后一次取完所有已到达的数据报
+                if let Err(e) = socket.readable().await {
+                    error!("socket readable error: {:?}", e);
+                    break;
+                }
+
+                loop {
+                    match socket.try_recv(&mut buf) {
+                        Ok(len) => Self::handle_message(
+                            &buf[..len],
+                            &display_setting_request_sender,
+                            &volume_setting_request_sender,
+                        ),
+                        Err(ref e) if e.kind() == io::ErrorKind::WouldBlock => break,
+                        Err(e) => {
+                            error!("socket recv error: {:?}", e);
+                            return;
                         }
                     }
-                    Err(ref e) if e.kind() == io::ErrorKind::WouldBlock => {
-                        yield_now().await;
-                        continue;
-                    }
-                    Err(e) => {
-                        error!("socket recv error: {:?}", e);
-                        break;
-                    }
                 }
             }
         });
@@ -99,6 +107,36 @@ impl Board {
         Ok(())
     }
 
+    /// 处理设备发来的单个数据报
+    fn handle_message(
+        data: &[u8],
+        display_setting_request_sender: &broadcast::Sender<DisplaySettingRequest>,
+        volume_setting_request_sender: &broadcast::Sender<f32>,
+    ) {
+        match data {
+            [CMD_DISPLAY_BRIGHTNESS, display_index, brightness, ..] => {
+                log::info!("recv: {:?}", data);
+                let result = display_setting_request_sender.send(DisplaySettingRequest {
+                    display_index: *display_index as usize,
+                    setting: crate::rpc::DisplaySetting::Brightness(*brightness),
+                });
+
+                if let Err(err) = result {
+                    error!("send display setting request to channel failed: {:?}", err);
+                }
+            }
+            [CMD_VOLUME, volume, ..] => {
+                log::info!("recv: {:?}", data);
+                let result = volume_setting_request_sender.send(*volume as f32 / 100.0);
+                if let Err(err) = result {
+                    error!("send volume setting request to channel failed: {:?}", err);
+                }
+            }
+            // 其他来源的流量已由已连接的socket在内核中过滤，这里只丢弃无法识别的数据报
+            _ => log::debug!("ignore unknown board message: {:?}", data),
+        }
+    }
+
     async fn subscribe_volume_changed(&mut self) {
         let channel = BoardMessageChannels::global().await;
         let mut volume_changed_rx = channel.volume_changed_sender.subscribe();
@@ -132,9 +170,7 @@ impl Board {
 
                 let socket = socket.as_ref().unwrap();
 
-                let mut buf = [0u8; 2];
-                buf[0] = 4;
-                buf[1] = (volume * 100.0) as u8;
+                let buf = [CMD_VOLUME, (volume * 100.0) as u8];
 
                 if let Err(err) = socket.send(&buf).await {
                     log::warn!("send volume changed failed: {err:?}");
@@ -146,7 +182,7 @@ impl Board {
         let volume = volume_manager.get_volume().await;
 
         if let Some(socket) = self.socket.as_ref() {
-            let buf = [4, (volume * 100.0) as u8];
+            let buf = [CMD_VOLUME, (volume * 100.0) as u8];
             if let Err(err) = socket.send(&buf).await {
                 log::warn!("send volume failed: {err:?}");
             }
@@ -190,10 +226,9 @@ impl Board {
 
                 let socket = socket.as_ref().unwrap();
 
-                let mut buf = [0u8; 3];
+                let mut buf = [CMD_DISPLAY_BRIGHTNESS, 0, 0];
                 let states = states.unwrap();
                 for (index, state) in states.iter().enumerate() {
-                    buf[0] = 3;
                     buf[1] = index as u8;
                     buf[2] = state.brightness as u8;
 
@@ -227,8 +262,7 @@ impl Board {
 
                 let socket = socket.as_ref().unwrap();
 
-                let mut buf = [0u8; 4];
-                buf[0] = 5;
+                let mut buf = [CMD_COLOR_CALIBRATION, 0, 0, 0];
                 buf[1..].copy_from_slice(&config.color_calibration.to_bytes());
 
                 log::info!("send led strip config changed: {:?}", &buf[..]);
@@ -242,7 +276,8 @@ impl Board {
         self.led_strip_config_changed_subscriber_handler = Some(handler);
     }
 
-    pub async fn send_colors(&self, buf: &[u8]) {
+    /// 连续发送同一帧的多个数据包，连接状态只检查一次
+    pub async fn send_colors_batch<T: AsRef<[u8]>>(&self, packets: &[T]) {
         let info = self.info.read().await;
         if self.socket.is_none() {
             log::debug!("Board {}: socket is None, skipping color send", info.host);
@@ -259,32 +294,49 @@ impl Board {
         }
 
         let socket = self.socket.as_ref().unwrap();
-        log::debug!("Sending {} bytes to board {}", buf.len(), info.host);
-
-        match socket.send(buf).await {
-            Ok(bytes_sent) => {
-                log::debug!(
-                    "Successfully sent {} bytes to board {}",
-                    bytes_sent,
-                    info.host
-                );
-            }
-            Err(err) => {
-                error!("Failed to send colors to board {}: {}", info.host, err);
+
+        // 已连接的socket直接send，逐包只处理错误，成功情况每批记录一次
+        let mut bytes_sent = 0;
+        for packet in packets {
+            match socket.send(packet.as_ref()).await {
+                Ok(len) => bytes_sent += len,
+                Err(err) => {
+                    error!("Failed to send colors to board {}: {}", info.host, err);
+                }
             }
         }
+
+        log::debug!(
+            "Sent {} packets ({} bytes) to board {}",
+            packets.len(),
+            bytes_sent,
+            info.host
+        );
+    }
+
+    /// 获取连接检查使用的套接字，首次调用时创建并连接到设备
+    async fn probe_socket(&self) -> anyhow::Result<&UdpSocket> {
+        self.probe_socket
+            .get_or_try_init(|| async {
+                let info = self.info.read().await;
+                let socket = bind_udp_socket()?;
+                socket.connect((info.address, info.port)).await?;
+                anyhow::Ok(socket)
+            })
+            .await
     }
 
     pub async fn check(&self) -> anyhow::Result<()> {
-        let info = self.info.read().await;
-        let socket = UdpSocket::bind("0.0.0.0:0").await?;
-        socket.connect((info.address, info.port)).await?;
-        drop(info);
+        let socket = self.probe_socket().await?;
+
+        // 丢弃上次检查超时后才到达的响应，避免被误认为本次的 pong
+        let mut buf = [0u8; PING_PACKET.len()];
+        while socket.try_recv(&mut buf).is_ok() {}
+        buf = [0u8; PING_PACKET.len()];
 
         let instant = std::time::Instant::now();
 
-        socket.send(&[1]).await?;
-        let mut buf = [0u8; 1];
+        socket.send(&PING_PACKET).await?;
         let recv_future = socket.recv(&mut buf);
 
         let check_result = timeout(Duration::from_secs(1), recv_future).await;
@@ -292,7 +344,7 @@ impl Board {
         match check_result {
             Ok(_) => {
                 let ttl = instant.elapsed();
-                if buf == [1] {
+                if buf == PING_PACKET {
                     info.connect_status = BoardConnectStatus::Connected;
                 } else if let BoardConnectStatus::Connecting(retry) = info.connect_status {
                     if retry < 10 {
@@ -3,9 +3,11 @@ mod board_info;
 mod channels;
 mod display_setting_request;
 mod udp;
+mod udp_socket;
 
 pub use board::*;
 pub use board_info::*;
 pub use channels::*;
 pub use display_setting_request::*;
 pub use udp::*;
+pub use udp_socket::*;
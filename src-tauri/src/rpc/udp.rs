@@ -1,16 +1,26 @@
-use std::{collections::HashMap, net::SocketAddr, sync::Arc, time::Duration};
+use std::{
+    collections::HashMap,
+    net::{IpAddr, SocketAddr},
+    sync::Arc,
+    time::Duration,
+};
 
 use futures::future::join_all;
 use mdns_sd::{ServiceDaemon, ServiceEvent};
 use paris::{error, info, warn};
-use tokio::sync::{watch, OnceCell, RwLock};
+use tokio::{
+    net::UdpSocket,
+    sync::{watch, OnceCell, RwLock},
+};
 
-use super::{Board, BoardInfo};
+use super::{bind_udp_socket, Board, BoardInfo};
 
 #[derive(Debug, Clone)]
 pub struct UdpRpc {
     boards: Arc<RwLock<HashMap<String, Board>>>,
     boards_change_sender: Arc<watch::Sender<Vec<BoardInfo>>>,
+    /// 直接发送使用的socket及其已连接的目标地址
+    direct_socket: Arc<RwLock<Option<(SocketAddr, Arc<UdpSocket>)>>>,
 }
 
 impl UdpRpc {
@@ -34,6 +44,7 @@ impl UdpRpc {
         Ok(Self {
             boards,
             boards_change_sender,
+            direct_socket: Arc::new(RwLock::new(None)),
         })
     }
 
@@ -87,68 +98,81 @@ impl UdpRpc {
         })?;
         let sender = self.boards_change_sender.clone();
 
-        while let Ok(event) = receiver.recv() {
-            match event {
-                ServiceEvent::ServiceResolved(info) => {
-                    info!(
-                        "Resolved a new service: {} host: {} port: {} IP: {:?} TXT properties: {:?}",
-                        info.get_fullname(),
-                        info.get_hostname(),
-                        info.get_port(),
-                        info.get_addresses(),
-                        info.get_properties(),
-                    );
-
-                    let mut boards = self.boards.write().await;
-
-                    let board_info = BoardInfo::new(
-                        info.get_fullname().to_string(),
-                        info.get_hostname().to_string(),
-                        *info.get_addresses().iter().next().unwrap(),
-                        info.get_port(),
-                    );
-
-                    let mut board = Board::new(board_info.clone());
-
-                    if let Err(err) = board.init_socket().await {
-                        error!("failed to init socket: {:?}", err);
-                        continue;
+        // 异步等待mDNS事件，不占用运行时的工作线程
+        while let Ok(event) = receiver.recv_async().await {
+            // 一次唤醒处理所有已就绪的事件，设备列表只锁定和发布一次
+            let mut events = vec![event];
+            events.extend(std::iter::from_fn(|| receiver.try_recv().ok()));
+
+            let mut boards = self.boards.write().await;
+            let mut changed = false;
+
+            for event in events {
+                match event {
+                    ServiceEvent::ServiceResolved(info) => {
+                        let Some(&address) = info.get_addresses().iter().next() else {
+                            warn!("service {} resolved without address", info.get_fullname());
+                            continue;
+                        };
+
+                        // mDNS 会周期性地重新解析同一设备，地址未变时沿用已建立的socket和订阅任务
+                        let socket_addr = SocketAddr::new(IpAddr::V4(address), info.get_port());
+                        if boards
+                            .get(info.get_fullname())
+                            .and_then(|board| board.get_socket_addr())
+                            == Some(socket_addr)
+                        {
+                            log::debug!("service {} unchanged, skip", info.get_fullname());
+                            continue;
+                        }
+
+                        info!(
+                            "Resolved a new service: {} host: {} port: {} IP: {:?} TXT properties: {:?}",
+                            info.get_fullname(),
+                            info.get_hostname(),
+                            info.get_port(),
+                            info.get_addresses(),
+                            info.get_properties(),
+                        );
+
+                        let board_info = BoardInfo::new(
+                            info.get_fullname().to_string(),
+                            info.get_hostname().to_string(),
+                            address,
+                            info.get_port(),
+                        );
+
+                        let mut board = Board::new(board_info.clone());
+
+                        if let Err(err) = board.init_socket().await {
+                            error!("failed to init socket: {:?}", err);
+                            continue;
+                        }
+
+                        boards.insert(board_info.fullname.clone(), board);
+                        changed = true;
                     }
-
-                    boards.insert(board_info.fullname.clone(), board);
-
-                    let tx_boards = boards
-                        .values()
-                        .map(|it| async move { it.info.read().await.clone() });
-                    let tx_boards = join_all(tx_boards).await;
-
-                    drop(boards);
-
-                    if let Err(err) = sender.send(tx_boards) {
-                        warn!("failed to send board change: {:?}", err);
+                    ServiceEvent::ServiceRemoved(_, fullname) => {
+                        changed |= boards.remove(&fullname).is_some();
+                    }
+                    _other_event => {
+                        // log::info!("{:?}", &other_event);
                     }
                 }
-                ServiceEvent::ServiceRemoved(_, fullname) => {
-                    let mut boards = self.boards.write().await;
-                    boards.remove(&fullname);
+            }
 
-                    let tx_boards = boards
-                        .values()
-                        .map(|it| async move { it.info.read().await.clone() });
-                    let tx_boards = join_all(tx_boards).await;
+            if changed {
+                let tx_boards = boards
+                    .values()
+                    .map(|it| async move { it.info.read().await.clone() });
+                let tx_boards = join_all(tx_boards).await;
 
-                    drop(boards);
+                drop(boards);
 
-                    if let Err(err) = sender.send(tx_boards) {
-                        warn!("failed to send board change: {:?}", err);
-                    }
-                }
-                _other_event => {
-                    // log::info!("{:?}", &other_event);
+                if let Err(err) = sender.send(tx_boards) {
+                    warn!("failed to send board change: {:?}", err);
                 }
             }
-
-            tokio::task::yield_now().await;
         }
 
         Ok(())
@@ -162,7 +186,8 @@ impl UdpRpc {
         self.boards_change_sender.borrow().clone()
     }
 
-    pub async fn send_to_all(&self, buff: &[u8]) -> anyhow::Result<()> {
+    /// 将同一帧的多个数据包并发发送给所有设备，设备列表只锁定一次
+    pub async fn send_batch_to_all<T: AsRef<[u8]>>(&self, packets: &[T]) -> anyhow::Result<()> {
         let boards = self.boards.read().await;
 
         if boards.is_empty() {
@@ -170,16 +195,29 @@ impl UdpRpc {
             return Ok(());
         }
 
-        log::debug!("Sending {} bytes to {} boards", buff.len(), boards.len());
+        log::debug!(
+            "Sending {} packets to {} boards",
+            packets.len(),
+            boards.len()
+        );
 
-        for board in boards.values() {
-            board.send_colors(buff).await;
-        }
+        // 每个设备使用各自的socket，同时向所有设备发送，避免设备数量增加时逐个等待
+        join_all(
+            boards
+                .values()
+                .map(|board| board.send_colors_batch(packets)),
+        )
+        .await;
 
         Ok(())
     }
 
-    pub async fn send_to(&self, buff: &[u8], target_addr: SocketAddr) -> anyhow::Result<()> {
+    /// 将同一帧的多个数据包发送给指定设备，目标设备只查找一次
+    pub async fn send_batch_to<T: AsRef<[u8]>>(
+        &self,
+        packets: &[T],
+        target_addr: SocketAddr,
+    ) -> anyhow::Result<()> {
         let boards = self.boards.read().await;
 
         if boards.is_empty() {
@@ -187,64 +225,89 @@ impl UdpRpc {
             return Err(anyhow::anyhow!("No boards available"));
         }
 
-        log::info!("🔍 Looking for target board: {target_addr}");
-        log::info!("📋 Available boards:");
-        for (name, board) in boards.iter() {
-            if let Some(socket_addr) = board.get_socket_addr() {
-                log::info!(
-                    "  - {}: {} (match: {})",
-                    name,
-                    socket_addr,
-                    socket_addr == target_addr
-                );
-            } else {
-                log::info!("  - {name}: No socket address");
-            }
-        }
-
-        let target_board = boards.values().find(|board| {
-            if let Some(socket_addr) = board.get_socket_addr() {
-                socket_addr == target_addr
-            } else {
-                false
-            }
-        });
+        let target_board = boards
+            .values()
+            .find(|board| board.get_socket_addr() == Some(target_addr));
 
         if let Some(board) = target_board {
-            log::info!(
-                "✅ Found target board! Sending {} bytes to: {}",
-                buff.len(),
+            board.send_colors_batch(packets).await;
+            log::debug!(
+                "Sent {} packets ({} bytes) to {}",
+                packets.len(),
+                packets.iter().map(|it| it.as_ref().len()).sum::<usize>(),
                 target_addr
             );
-            board.send_colors(buff).await;
             Ok(())
         } else {
-            warn!("❌ Target board with address {} not found", target_addr);
+            // 仅在查找失败时才列出设备，避免每帧输出多行日志
+            let available: Vec<_> = boards
+                .iter()
+                .map(|(name, board)| format!("{name}: {:?}", board.get_socket_addr()))
+                .collect();
+            warn!(
+                "❌ Target board with address {} not found, available boards: [{}]",
+                target_addr,
+                available.join(", ")
+            );
             Err(anyhow::anyhow!("Target board not found"))
         }
     }
 
-    /// 直接发送数据到指定地址，不检查设备列表（用于调试和测试）
-    pub async fn send_to_direct(&self, buff: &[u8], target_addr: SocketAddr) -> anyhow::Result<()> {
-        log::info!(
-            "🚀 Direct send: {} bytes to {} (bypassing device check)",
-            buff.len(),
-            target_addr
-        );
+    /// 直接批量发送数据包到指定地址，不检查设备列表（用于调试和测试）
+    pub async fn send_batch_to_direct<T: AsRef<[u8]>>(
+        &self,
+        packets: &[T],
+        target_addr: SocketAddr,
+    ) -> anyhow::Result<()> {
+        let socket = self.direct_socket(target_addr).await?;
+
+        let mut total_sent = 0;
+        for packet in packets {
+            match socket.send(packet.as_ref()).await {
+                Ok(bytes_sent) => total_sent += bytes_sent,
+                // 已连接的socket会把目标端口不可达（ICMP）报告为下一次发送的错误，
+                // 调试目标未启动时属于正常情况，与未连接时的 send_to 一样忽略
+                Err(err) if err.kind() == std::io::ErrorKind::ConnectionRefused => {
+                    log::debug!("Direct send to {target_addr} refused, target not listening");
+                }
+                Err(err) => {
+                    error!("❌ Direct send failed to {}: {}", target_addr, err);
+                    return Err(anyhow::anyhow!("Direct send failed: {}", err));
+                }
+            }
+        }
 
-        // 创建临时UDP socket直接发送
-        let socket = tokio::net::UdpSocket::bind("0.0.0.0:0").await?;
+        log::debug!(
+            "Direct send: {} packets ({total_sent} bytes) to {target_addr} (bypassing device check)",
+            packets.len()
+        );
+        Ok(())
+    }
 
-        match socket.send_to(buff, target_addr).await {
-            Ok(bytes_sent) => {
-                log::info!("✅ Direct send successful: {bytes_sent} bytes sent to {target_addr}");
-                Ok(())
+    /// 获取已连接到目标地址的直接发送socket，目标不变时复用
+    ///
+    /// 连接后的UDP socket由内核固定目标地址，每次发送无需再传入和查找地址
+    async fn direct_socket(&self, target_addr: SocketAddr) -> anyhow::Result<Arc<UdpSocket>> {
+        if let Some((addr, socket)) = self.direct_socket.read().await.as_ref() {
+            if *addr == target_addr {
+                return Ok(socket.clone());
             }
-            Err(err) => {
-                error!("❌ Direct send failed to {}: {}", target_addr, err);
-                Err(anyhow::anyhow!("Direct send failed: {}", err))
+        }
+
+        let mut direct_socket = self.direct_socket.write().await;
+        // 等待写锁期间可能已被其他任务更新
+        if let Some((addr, socket)) = direct_socket.as_ref() {
+            if *addr == target_addr {
+                return Ok(socket.clone());
             }
         }
+
+        let socket = bind_udp_socket()?;
+        socket.connect(target_addr).await?;
+        let socket = Arc::new(socket);
+        *direct_socket = Some((target_addr, socket.clone()));
+
+        Ok(socket)
     }
 
     pub async fn check_boards(&self) {
@@ -265,11 +328,11 @@ impl UdpRpc {
                 .map(|it| async move { it.info.read().await.clone() });
             let prev_boards = join_all(prev_boards).await;
 
-            // Check all boards
-            for board in boards.values() {
-                if let Err(err) = board.check().await {
-                    error!("failed to check board: {:?}", err);
-                }
+            // Check all boards concurrently, so one unreachable board's timeout
+            // does not delay the others
+            let results = join_all(boards.values().map(|board| board.check())).await;
+            for err in results.into_iter().filter_map(Result::err) {
+                error!("failed to check board: {:?}", err);
             }
 
             // Get current board states after check
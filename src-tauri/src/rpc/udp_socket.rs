@@ -0,0 +1,36 @@
+use std::net::{Ipv4Addr, SocketAddr};
+
+use socket2::{Domain, Protocol, Socket, Type};
+use tokio::net::UdpSocket;
+
+/// 内核发送缓冲区大小，足以容纳整帧LED数据的连续发送
+const SEND_BUFFER_SIZE: usize = 4 * 1024 * 1024;
+
+/// 内核接收缓冲区大小，避免设备连续上报（如旋钮调节音量、亮度）时被内核丢弃
+const RECV_BUFFER_SIZE: usize = 1024 * 1024;
+
+/// 创建绑定到随机端口的UDP socket，并放大内核收发缓冲区
+///
+/// 系统默认的缓冲区较小（macOS 上尤其明显），整帧LED数据连续发出时容易被内核丢弃
+pub fn bind_udp_socket() -> anyhow::Result<UdpSocket> {
+    let socket = Socket::new(Domain::IPV4, Type::DGRAM, Some(Protocol::UDP))?;
+
+    // 缓冲区大小受系统上限约束，设置失败时沿用默认值
+    if let Err(err) = socket.set_send_buffer_size(SEND_BUFFER_SIZE) {
+        log::warn!("failed to set UDP send buffer size: {err:?}");
+    }
+    if let Err(err) = socket.set_recv_buffer_size(RECV_BUFFER_SIZE) {
+        log::warn!("failed to set UDP receive buffer size: {err:?}");
+    }
+    // Linux 内核会将设置值翻倍，这里记录实际生效的大小
+    log::debug!(
+        "UDP buffer size: send {:?}, receive {:?}",
+        socket.send_buffer_size(),
+        socket.recv_buffer_size()
+    );
+
+    socket.set_nonblocking(true)?;
+    socket.bind(&SocketAddr::from((Ipv4Addr::UNSPECIFIED, 0)).into())?;
+
+    Ok(UdpSocket::from_std(socket.into())?)
+}
@@ -8,7 +8,7 @@ use paris::warn;
 use tauri::async_runtime::RwLock;
 use tokio::sync::{broadcast, watch, OnceCell};
 use tokio::task::yield_now;
-use tokio::time::sleep;
+use tokio::time::{sleep, timeout};
 
 use crate::{ambient_light::SamplePointMapper, screenshot::Screenshot};
 
@@ -145,13 +145,19 @@ impl ScreenshotManager {
 
         // Start background task for screen capture
         tokio::spawn(async move {
+            // 截图失败时使用的黑色帧只分配一次，避免每帧重新分配整屏缓冲区
+            let fallback_bitmap = Arc::new(vec![0u8; 1920 * 1080 * 4]);
+
+            // 订阅一次启用状态，读取状态时标记为已读，空闲等待不会错过期间的变化
+            let state_manager =
+                crate::ambient_light_state::AmbientLightStateManager::global().await;
+            let mut enabled_rx = state_manager.subscribe_enabled();
+
             // Implement screen capture using screen-capture-kit
             loop {
                 // Check if ambient light is enabled and not in color calibration mode
                 let should_capture = {
-                    let state_manager =
-                        crate::ambient_light_state::AmbientLightStateManager::global().await;
-                    let ambient_light_enabled = state_manager.is_enabled().await;
+                    let ambient_light_enabled = *enabled_rx.borrow_and_update();
 
                     // Also check LED data send mode - don't capture during color calibration
                     let led_sender = crate::led_data_sender::LedDataSender::global().await;
@@ -173,7 +179,7 @@ impl ScreenshotManager {
                             if let Err(_err) = merged_screenshot_tx.send(screenshot.clone()) {
                                 // log::warn!("merged_screenshot_tx.send failed: {}", err);
                             }
-                            if let Err(err) = tx_for_send.send(screenshot.clone()) {
+                            if let Err(err) = tx_for_send.send(screenshot) {
                                 log::warn!("display {display_id} screenshot_tx.send failed: {err}");
                             }
                         }
@@ -188,7 +194,7 @@ impl ScreenshotManager {
                                 1080,
                                 1920,
                                 1920 * 4, // Assuming RGBA format
-                                Arc::new(vec![0u8; 1920 * 1080 * 4]),
+                                fallback_bitmap.clone(),
                                 scale_factor,
                                 scale_factor,
                             );
@@ -199,14 +205,16 @@ impl ScreenshotManager {
                             if let Err(_err) = merged_screenshot_tx.send(screenshot.clone()) {
                                 // log::warn!("merged_screenshot_tx.send failed: {}", err);
                             }
-                            if let Err(err) = tx_for_send.send(screenshot.clone()) {
+                            if let Err(err) = tx_for_send.send(screenshot) {
                                 log::warn!("display {display_id} screenshot_tx.send failed: {err}");
                             }
                         }
                     }
                 } else {
-                    // If ambient light is disabled or in color calibration mode, sleep longer to reduce CPU usage
-                    sleep(Duration::from_millis(1000)).await;
+                    // If ambient light is disabled or in color calibration mode, wait for the
+                    // enabled state to change instead of polling; re-check at least once per
+                    // second because leaving color calibration mode is not notified
+                    let _ = timeout(Duration::from_millis(1000), enabled_rx.changed()).await;
                 }
 
                 // Sleep for a frame duration when enabled
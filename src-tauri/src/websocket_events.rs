@@ -71,6 +71,16 @@ impl WebSocketEventPublisher {
 
     /// 发布LED颜色变化事件（按物理顺序排列的颜色数据）
     pub async fn publish_led_sorted_colors_changed(&self, sorted_colors: &[u8], led_offset: usize) {
+        // 每帧都会调用，无订阅者时不拷贝颜色数据
+        if self
+            .ws_manager
+            .subscriber_count("LedSortedColorsChanged")
+            .await
+            == 0
+        {
+            return;
+        }
+
         // 获取当前模式信息和时间戳
         let sender = crate::led_data_sender::LedDataSender::global().await;
         let current_mode = sender.get_mode().await;
@@ -114,6 +124,19 @@ impl WebSocketEventPublisher {
         strip_index: usize,
         colors: &[u8],
     ) {
+        // 支持按显示器过滤的订阅
+        let display_event = format!("LedStripColorsChanged:display_{}", display_id);
+        let display_subscribers = self.ws_manager.subscriber_count(&display_event).await;
+        let general_subscribers = self
+            .ws_manager
+            .subscriber_count("LedStripColorsChanged")
+            .await;
+
+        // 无订阅者时不构造消息，避免每帧拷贝颜色数据
+        if display_subscribers == 0 && general_subscribers == 0 {
+            return;
+        }
+
         let sender = crate::led_data_sender::LedDataSender::global().await;
         let current_mode = sender.get_mode().await;
 
@@ -136,19 +159,25 @@ impl WebSocketEventPublisher {
             },
         };
 
-        // 支持按显示器过滤的订阅
-        let display_event = format!("LedStripColorsChanged:display_{}", display_id);
-
-        // 发送到特定显示器订阅者
-        match self
-            .ws_manager
-            .send_to_subscribers(&display_event, message.clone())
-            .await
-        {
-            Ok(_) => {}
-            Err(e) => {
+        // 仅在两类订阅者都存在时才克隆消息，否则直接转发原消息
+        if display_subscribers > 0 && general_subscribers > 0 {
+            if let Err(e) = self
+                .ws_manager
+                .send_to_subscribers(&display_event, message.clone())
+                .await
+            {
+                log::error!("❌ 发送LED灯带颜色变化事件到显示器 {display_id} 失败: {e}");
+            }
+        } else if display_subscribers > 0 {
+            // 发送到特定显示器订阅者
+            if let Err(e) = self
+                .ws_manager
+                .send_to_subscribers(&display_event, message)
+                .await
+            {
                 log::error!("❌ 发送LED灯带颜色变化事件到显示器 {display_id} 失败: {e}");
             }
+            return;
         }
 
         // 发送到通用订阅者（向后兼容）